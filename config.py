@@ -3,22 +3,31 @@ Configuration settings for the TikTok to YouTube Shorts repurposing tool.
 """
 import os
 from dotenv import load_dotenv
-from typing import List, Dict
 
-# Load environment variables
-load_dotenv()
+# Load environment variables once (module globals survive importlib.reload),
+# then snapshot them so the lookups below read from a plain dict
+if not globals().get('_loaded', False):
+    load_dotenv()
+    _loaded = True
+_ENV = os.environ.copy()
+
+# Proxy configuration shared by TIKTOK_SCRAPING and PROXY_SETTINGS
+_PROXY = {
+    'use_proxy': _ENV.get('USE_PROXY', 'false').lower() == 'true',
+    'proxy_url': _ENV.get('PROXY_URL', '')
+}
 
 # TikTok scraping settings
 TIKTOK_SCRAPING = {
-    'use_proxy': os.getenv('USE_PROXY', 'false').lower() == 'true',
-    'proxy_url': os.getenv('PROXY_URL', ''),
-    'request_delay': float(os.getenv('REQUEST_DELAY', '2.0')),  # Delay between requests in seconds
-    'retry_attempts': int(os.getenv('RETRY_ATTEMPTS', '3')),    # Number of retries for failed requests
-    'timeout': int(os.getenv('REQUEST_TIMEOUT', '30')),         # Request timeout in seconds
+    'use_proxy': _PROXY['use_proxy'],
+    'proxy_url': _PROXY['proxy_url'],
+    'request_delay': float(_ENV.get('REQUEST_DELAY', '2.0')),  # Delay between requests in seconds
+    'retry_attempts': int(_ENV.get('RETRY_ATTEMPTS', '3')),    # Number of retries for failed requests
+    'timeout': int(_ENV.get('REQUEST_TIMEOUT', '30')),         # Request timeout in seconds
 }
 
 # YouTube API settings
-YOUTUBE_CLIENT_SECRETS_FILE = os.getenv('YOUTUBE_CLIENT_SECRETS_FILE', 'client_secrets.json')
+YOUTUBE_CLIENT_SECRETS_FILE = _ENV.get('YOUTUBE_CLIENT_SECRETS_FILE', 'client_secrets.json')
 YOUTUBE_SCOPES = [
     'https://www.googleapis.com/auth/youtube.upload',
     'https://www.googleapis.com/auth/youtube.readonly',
@@ -64,15 +73,15 @@ CONTENT_FILTERS = {
 
 # Reposting settings
 REPOSTING_SETTINGS = {
-    'max_videos_per_day': int(os.getenv('MAX_VIDEOS_PER_DAY', 3)),
-    'video_quality': os.getenv('VIDEO_QUALITY', '720p'),
+    'max_videos_per_day': int(_ENV.get('MAX_VIDEOS_PER_DAY', 3)),
+    'video_quality': _ENV.get('VIDEO_QUALITY', '720p'),
     'add_watermark': False,
     'add_credits': False,
     'credits_format': 'Original content by @{creator} on TikTok',
     'auto_schedule': True,
     'schedule_times': ['08:00', '12:00', '18:00'],  # UTC times
     'publish_days': ['Monday', 'Wednesday', 'Friday'],
-    'file_retention_days': int(os.getenv('FILE_RETENTION_DAYS', 7))  # How many days to keep downloaded/processed files
+    'file_retention_days': int(_ENV.get('FILE_RETENTION_DAYS', 7))  # How many days to keep downloaded/processed files
 }
 
 # YouTube upload defaults
@@ -90,8 +99,8 @@ YOUTUBE_DEFAULTS = {
 
 # Proxy settings
 PROXY_SETTINGS = {
-    'use_proxy': os.getenv('USE_PROXY', 'false').lower() == 'true',
-    'proxy_url': os.getenv('PROXY_URL', '')
+    'use_proxy': _PROXY['use_proxy'],
+    'proxy_url': _PROXY['proxy_url']
 }
 
 # Logging settings
@@ -100,38 +109,3 @@ LOGGING = {
     'log_file': 'shortssync.log',
     'log_format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 }
-
-def filter_by_content_policy(self, videos: List[Dict]) -> List[Dict]:
-    """Filter videos based on the content policy settings."""
-    filtered_videos = []
-    for video in videos:
-        # Duration checks
-        duration = float(video.get('video', {}).get('duration', 0))
-        if duration < self.filters.get("min_duration", 0) or duration > self.filters.get("max_duration", 60):
-            logger.debug(f"Filtered out video (duration {duration}s): {video.get('desc', 'Unknown')}")
-            continue
-            
-        # View count threshold
-        views = int(video.get('stats', {}).get('playCount', 0))
-        if views < self.filters.get("min_views", 0):
-            logger.debug(f"Filtered out video (only {views} views): {video.get('desc', 'Unknown')}")
-            continue
-            
-        # Engagement rate check
-        engagement_rate = self.calculate_engagement_rate(video)
-        if engagement_rate < self.filters.get("min_engagement_rate", 0):
-            logger.debug(f"Filtered out video (low engagement {engagement_rate}%): {video.get('desc', 'Unknown')}")
-            continue
-            
-        # Check excluded hashtags
-        caption = video.get('desc', '')
-        excluded_tags = self.filters.get("exclude_hashtags", [])
-        if any(tag.lower() in caption.lower() for tag in excluded_tags):
-            logger.debug(f"Filtered out video (excluded hashtags): {video.get('desc', 'Unknown')}")
-            continue
-            
-        # Passed all filters
-        filtered_videos.append(video)
-    
-    logger.info(f"Filtered down to {len(filtered_videos)} videos from {len(videos)} based on content policy")
-    return filtered_videos 
\ No newline at end of file
@@ -1,14 +1,60 @@
 """
 Module for analyzing and ranking TikTok content based on performance metrics.
 """
+import heapq
 import logging
-from typing import List, Dict, Any, Tuple
-import pandas as pd
+import re
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 import config
 import math
+import zlib
 
 logger = logging.getLogger(__name__)
 
+# Channel size buckets used for dynamic view thresholds, indexed by np.digitize
+# of the channel's average views against CHANNEL_SIZE_BOUNDS
+CHANNEL_SIZE_BOUNDS = (20000, 100000)
+CHANNEL_SIZES = ("small", "medium", "large")
+THRESHOLD_SCALES = (0.7, 0.8, 0.7)
+THRESHOLD_MIN_BOUNDS = (3000, 8000, 15000)
+
+# Whitespace-delimited words starting with '#', same tokens as caption.split()
+_HASHTAG_RE = re.compile(r'(?<!\S)#\S*')
+
+# Shared default for videos without 'stats' / 'video' data (never mutated)
+_EMPTY = {}
+
+def _extract_stats(video: Dict[str, Any]) -> Tuple[int, int, int, int]:
+    """
+    Extract TikTok statistics from a video with a single lookup of its stats.
+    
+    Args:
+        video (Dict[str, Any]): Video data
+        
+    Returns:
+        Tuple[int, int, int, int]: (views, likes, comments, shares)
+    """
+    stats = video.get('stats') or _EMPTY
+    return (
+        int(stats.get('playCount', 0)),
+        int(stats.get('diggCount', 0)),
+        int(stats.get('commentCount', 0)),
+        int(stats.get('shareCount', 0))
+    )
+
+def _extract_duration(video: Dict[str, Any]) -> float:
+    """
+    Extract a video's duration in seconds.
+    
+    Args:
+        video (Dict[str, Any]): Video data
+        
+    Returns:
+        float: Duration in seconds, 0 if unknown
+    """
+    return float((video.get('video') or _EMPTY).get('duration', 0))
+
 class ContentAnalyzer:
     """Analyzes and ranks TikTok content based on performance metrics."""
     
@@ -16,15 +62,11 @@ class ContentAnalyzer:
         """Initialize the content analyzer with performance metrics from config."""
         self.metrics = config.PERFORMANCE_METRICS
         self.filters = config.CONTENT_FILTERS
-        self.setup_logging()
-    
-    def setup_logging(self):
-        """Set up logging for the analyzer."""
-        logging.basicConfig(
-            level=getattr(logging, config.LOGGING['level']),
-            format=config.LOGGING['log_format'],
-            filename=config.LOGGING['log_file']
-        )
+        
+        # Freeze metric order and weights once so scoring is a single dot product
+        self._metric_names = tuple(self.metrics)
+        self._weights = np.array([self.metrics[metric] for metric in self._metric_names])
+        self._weights.setflags(write=False)
     
     def analyze_videos(self, videos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -40,36 +82,40 @@ class ContentAnalyzer:
             logger.warning("No videos to analyze")
             return []
         
-        # Convert to DataFrame for easier analysis
-        df = pd.DataFrame(videos)
-        
-        # Calculate normalized metrics
         logger.info(f"Analyzing {len(videos)} videos")
         
-        # Normalize each metric (scale to 0-1)
-        for metric, weight in self.metrics.items():
-            if metric in df.columns and len(df) > 1:  # Ensure we have the metric and multiple videos
-                # Avoid division by zero by adding a small value
-                max_val = df[metric].max() + 0.0001
-                df[f'norm_{metric}'] = df[metric] / max_val
-            elif metric in df.columns:
-                # If only one video, normalize to 1
-                df[f'norm_{metric}'] = 1.0
-            else:
+        metric_names = self._metric_names
+        
+        # Build a single (videos x metrics) matrix straight from the video data
+        values = np.array(
+            [[video.get(metric) or 0 for metric in metric_names] for video in videos],
+            dtype=float
+        )
+        
+        # Metrics missing from every video contribute nothing to the score
+        present = np.array([any(metric in video for video in videos) for metric in metric_names])
+        for metric, found in zip(metric_names, present):
+            if not found:
                 logger.warning(f"Metric '{metric}' not found in video data")
-                df[f'norm_{metric}'] = 0.0
+        
+        # Normalize each metric (scale to 0-1)
+        if len(videos) > 1:
+            # Avoid division by zero by adding a small value
+            norm = values / (values.max(axis=0) + 0.0001)
+        else:
+            # If only one video, normalize to 1
+            norm = np.ones_like(values)
+        norm[:, ~present] = 0.0
         
         # Calculate weighted performance score
-        df['performance_score'] = 0.0
-        for metric, weight in self.metrics.items():
-            if f'norm_{metric}' in df.columns:
-                df['performance_score'] += df[f'norm_{metric}'] * weight
+        scores = norm @ self._weights
         
-        # Sort by performance score (descending)
-        df = df.sort_values('performance_score', ascending=False)
+        # Attach scores directly to the video dictionaries
+        for video, score in zip(videos, scores):
+            video['performance_score'] = float(score)
         
-        # Convert back to list of dictionaries with score
-        result = df.to_dict('records')
+        # Sort by performance score (descending)
+        result = [videos[i] for i in np.argsort(-scores, kind='stable')]
         
         logger.info(f"Analyzed {len(result)} videos")
         return result
@@ -90,10 +136,23 @@ class ContentAnalyzer:
             logger.warning(f"Channel {channel_name}: No videos to select from")
             return []
         
-        # First apply content policy filters with dynamic thresholds
-        filtered_videos = self.filter_by_content_policy(videos, channel_name)
-        
-        if not filtered_videos:
+        # Extract every metric once, then apply the content policy as boolean masks
+        views, durations, scores = self._policy_metrics(videos)
+        filtered_idx = np.flatnonzero(self._content_policy_mask(videos, channel_name, views, durations, scores))
+        
+        if filtered_idx.size:
+            # Only the top N are needed, so pick them without sorting every survivor
+            # (nlargest keeps the original order among equal scores, like a stable sort)
+            score_list = scores.tolist()
+            top_idx = heapq.nlargest(top_n, filtered_idx.tolist(), key=score_list.__getitem__)
+            ranked_videos = []
+            for rank, i in enumerate(top_idx, start=1):
+                video = videos[i]
+                video['engagement_score'] = score_list[i]
+                video['rank'] = rank
+                video['rank_description'] = f"Rank {rank} of {filtered_idx.size} videos"
+                ranked_videos.append(video)
+        else:
             logger.warning(f"Channel {channel_name}: All videos filtered out by content policy")
             # If too strict, we could fall back to just duration filtering and newest videos
             try:
@@ -101,7 +160,7 @@ class ContentAnalyzer:
                 duration_filtered = []
                 for v in videos:
                     try:
-                        duration = float(v.get('video', {}).get('duration', 0))
+                        duration = _extract_duration(v)
                         if 3 <= duration <= 60:  # Between 3 and 60 seconds for Shorts
                             duration_filtered.append(v)
                     except Exception as e:
@@ -109,29 +168,22 @@ class ContentAnalyzer:
                 
                 # If we still have videos after basic filtering
                 if duration_filtered:
-                    # Sort by creation time (newest first) as a fallback
-                    filtered_videos = sorted(
-                        duration_filtered, 
-                        key=lambda x: int(x.get('createTime', 0)), 
-                        reverse=True
-                    )[:top_n]
+                    # Take the newest videos by creation time as a fallback
+                    filtered_videos = self._select_newest(duration_filtered, top_n)
                     logger.info(f"Channel {channel_name}: Using duration + recency filter as fallback. Found {len(filtered_videos)} videos.")
                 else:
                     # Last resort: just take the newest few videos regardless of duration
-                    filtered_videos = sorted(
-                        videos, 
-                        key=lambda x: int(x.get('createTime', 0)), 
-                        reverse=True
-                    )[:top_n]
+                    filtered_videos = self._select_newest(videos, top_n)
                     logger.info(f"Channel {channel_name}: Using only recency as filter. Found {len(filtered_videos)} videos.")
             except Exception as e:
                 logger.warning(f"Error applying fallback filtering: {str(e)}")
                 # Absolute last resort: just take the first few videos
                 filtered_videos = videos[:top_n]
                 logger.info(f"Channel {channel_name}: Using no filtering (last resort). Taking {len(filtered_videos)} videos.")
-        
-        # Rank videos using our engagement scoring system
-        ranked_videos = self.rank_videos(filtered_videos)
+            
+            # Rank the fallback selection, reusing the scores computed above
+            score_by_id = {id(video): float(score) for video, score in zip(videos, scores)}
+            ranked_videos = self.rank_videos(filtered_videos, score_by_id)
         
         # Select the top N videos
         selected = ranked_videos[:min(top_n, len(ranked_videos))]
@@ -142,10 +194,7 @@ class ContentAnalyzer:
         for i, video in enumerate(selected):
             try:
                 score = video.get('engagement_score', 0)
-                stats = video.get('stats', {})
-                views = int(stats.get('playCount', 0))
-                likes = int(stats.get('diggCount', 0))
-                comments = int(stats.get('commentCount', 0))
+                views, likes, comments, _ = _extract_stats(video)
                 
                 logger.info(f"Channel {channel_name}: Selected #{i+1}: Score: {score:.2f}, Views: {views}, Likes: {likes}, Comments: {comments}")
             except Exception as e:
@@ -154,6 +203,35 @@ class ContentAnalyzer:
         
         return selected
     
+    def _select_newest(self, videos: List[Dict], top_n: int) -> List[Dict]:
+        """
+        Select the most recently created videos without sorting the whole list.
+        
+        Args:
+            videos (List[Dict]): List of video data
+            top_n (int): Number of videos to select
+            
+        Returns:
+            List[Dict]: Up to top_n videos, newest first
+        """
+        if top_n <= 0 or not videos:
+            return []
+        
+        create_times = np.fromiter(
+            (int(video.get('createTime', 0)) for video in videos),
+            dtype=np.int64,
+            count=len(videos)
+        )
+        
+        # Partition out the newest top_n in O(N), then order just those
+        if top_n < len(videos):
+            idx = np.sort(np.argpartition(-create_times, top_n - 1)[:top_n])
+        else:
+            idx = np.arange(len(videos))
+        idx = idx[np.argsort(-create_times[idx], kind='stable')]
+        
+        return [videos[i] for i in idx]
+    
     def get_engagement_rate(self, video: Dict[str, Any]) -> float:
         """
         Calculate the engagement rate for a video.
@@ -166,16 +244,26 @@ class ContentAnalyzer:
         Returns:
             float: Engagement rate percentage
         """
-        views = video.get('views', 0)
+        engagement = self._engagement_rate_raw(
+            video.get('views', 0),
+            video.get('likes', 0),
+            video.get('comments', 0),
+            video.get('shares', 0)
+        )
+        return round(engagement, 2)
+    
+    def _engagement_rate_raw(self, views: int, likes: int, comments: int, shares: int) -> float:
+        """
+        Calculate the unrounded engagement rate percentage.
+        
+        Aggregations should sum these raw values and round only the final result.
+        
+        Returns:
+            float: Engagement rate percentage (0.0 when there are no views)
+        """
         if views == 0:
             return 0.0
-            
-        likes = video.get('likes', 0)
-        comments = video.get('comments', 0)
-        shares = video.get('shares', 0)
-        
-        engagement = (likes + comments + shares) / views * 100
-        return round(engagement, 2)
+        return (likes + comments + shares) / views * 100
     
     def get_video_statistics(self, videos: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -199,21 +287,31 @@ class ContentAnalyzer:
             }
         
         total_videos = len(videos)
-        total_views = sum(video.get('views', 0) for video in videos)
-        total_likes = sum(video.get('likes', 0) for video in videos)
-        total_comments = sum(video.get('comments', 0) for video in videos)
-        total_shares = sum(video.get('shares', 0) for video in videos)
-        total_duration = sum(video.get('duration', 0) for video in videos)
+        total_views = total_likes = total_comments = total_shares = total_duration = 0
+        total_engagement_rate = 0.0
+        
+        # Accumulate all totals in a single pass over the videos
+        for video in videos:
+            views = video.get('views', 0)
+            likes = video.get('likes', 0)
+            comments = video.get('comments', 0)
+            shares = video.get('shares', 0)
+            
+            total_views += views
+            total_likes += likes
+            total_comments += comments
+            total_shares += shares
+            total_duration += video.get('duration', 0)
+            
+            # Sum raw rates so rounding error does not accumulate
+            total_engagement_rate += self._engagement_rate_raw(views, likes, comments, shares)
         
         avg_views = total_views / total_videos
         avg_likes = total_likes / total_videos
         avg_comments = total_comments / total_videos
         avg_shares = total_shares / total_videos
         avg_duration = total_duration / total_videos
-        
-        # Calculate average engagement rate
-        engagement_rates = [self.get_engagement_rate(video) for video in videos]
-        avg_engagement_rate = sum(engagement_rates) / total_videos
+        avg_engagement_rate = total_engagement_rate / total_videos
         
         return {
             'total_videos': total_videos,
@@ -236,9 +334,7 @@ class ContentAnalyzer:
             List[str]: List of hashtags
         """
         caption = video.get('caption', '')
-        words = caption.split()
-        hashtags = [word for word in words if word.startswith('#')]
-        return hashtags
+        return _HASHTAG_RE.findall(caption)
 
     def calculate_engagement_score(self, video):
         """
@@ -253,10 +349,7 @@ class ContentAnalyzer:
         """
         # Extract metrics with safety checks
         try:
-            views = int(video.get('stats', {}).get('playCount', 0))
-            likes = int(video.get('stats', {}).get('diggCount', 0))
-            comments = int(video.get('stats', {}).get('commentCount', 0))
-            shares = int(video.get('stats', {}).get('shareCount', 0))
+            views, likes, comments, shares = _extract_stats(video)
             
             # If all metrics are zero, use fallback scoring
             if views == 0 and likes == 0 and comments == 0 and shares == 0:
@@ -269,11 +362,11 @@ class ContentAnalyzer:
                     logger.info(f"Using fallback scoring for video with no metrics: {score:.2f}")
                     return score
                 except:
-                    # If create time is also not available, assign a small random score
-                    # This ensures some variety in selection rather than always the same videos
-                    import random
-                    score = random.uniform(0.1, 1.0)
-                    logger.info(f"Using random fallback scoring: {score:.2f}")
+                    # If create time is also not available, derive a small score (0.1-1.0)
+                    # from the video ID so ordering varies across videos but stays stable
+                    video_key = str(video.get('id', video.get('desc', ''))).encode()
+                    score = 0.1 + 0.9 * (zlib.crc32(video_key) & 0xFFFF) / 65535.0
+                    logger.info(f"Using ID-based fallback scoring: {score:.2f}")
                     return score
             
             # Avoid division by zero
@@ -300,12 +393,39 @@ class ContentAnalyzer:
             # Return a default score to avoid breaking the pipeline
             return 0.5
 
-    def rank_videos(self, videos: List[Dict]) -> List[Dict]:
+    def _engagement_scores(self, videos: List[Dict], views: np.ndarray, likes: np.ndarray,
+                           comments: np.ndarray, shares: np.ndarray) -> np.ndarray:
+        """
+        Calculate engagement scores for a batch of videos at once.
+        
+        Uses the same formula as calculate_engagement_score, with log10 and the
+        engagement rate evaluated over whole arrays instead of per video.
+        
+        Args:
+            videos (List[Dict]): List of video data, aligned with the metric arrays
+            views, likes, comments, shares (np.ndarray): Per-video metrics
+            
+        Returns:
+            np.ndarray: Engagement score per video
+        """
+        engagement_rate = (likes + comments + shares) / np.maximum(views, 1)
+        scores = np.where(views > 0, 0.4 * np.log10(views + 1) + 6.0 * engagement_rate, 0.0)
+        
+        # Videos without any metrics keep the per-video fallback scoring
+        no_metrics = (views == 0) & (likes == 0) & (comments == 0) & (shares == 0)
+        for i in np.flatnonzero(no_metrics):
+            scores[i] = self.calculate_engagement_score(videos[i])
+        
+        return scores
+    
+    def rank_videos(self, videos: List[Dict], scores: Optional[Dict[int, float]] = None) -> List[Dict]:
         """
         Rank videos based on metrics and prepare them with rankings.
         
         Args:
             videos (List[Dict]): List of video data
+            scores (Optional[Dict[int, float]]): Engagement scores already computed
+                for these videos, keyed by id() of the video dictionary
             
         Returns:
             List[Dict]: Ranked video data with scores
@@ -313,9 +433,23 @@ class ContentAnalyzer:
         if not videos:
             return []
         
-        # For each video, calculate its engagement score
+        # Reuse precomputed engagement scores where we have them
+        scores = scores or {}
+        pending = [video for video in videos if id(video) not in scores]
+        
+        # Score the rest in one vectorized pass
+        if pending:
+            try:
+                metrics = np.array([_extract_stats(video) for video in pending], dtype=float)
+                batch_scores = self._engagement_scores(pending, *metrics.T)
+            except Exception as e:
+                logger.warning(f"Error calculating batch engagement scores: {str(e)}")
+                batch_scores = [self.calculate_engagement_score(video) for video in pending]
+            scores = dict(scores)
+            scores.update((id(video), float(score)) for video, score in zip(pending, batch_scores))
+        
         for video in videos:
-            video['engagement_score'] = self.calculate_engagement_score(video)
+            video['engagement_score'] = scores[id(video)]
         
         # Sort videos by their engagement score, highest first
         ranked_videos = sorted(videos, key=lambda x: x.get('engagement_score', 0), reverse=True)
@@ -346,45 +480,35 @@ class ContentAnalyzer:
         # Calculate average views for this channel
         try:
             # Extract view counts
-            view_counts = [int(video.get('stats', {}).get('playCount', 0)) for video in videos]
+            view_counts = np.fromiter(
+                (int((video.get('stats') or _EMPTY).get('playCount', 0)) for video in videos),
+                dtype=np.int64,
+                count=len(videos)
+            )
             # Filter out zeros to avoid skewing the average
-            view_counts = [views for views in view_counts if views > 0]
+            view_counts = view_counts[view_counts > 0]
             
-            if not view_counts:
+            if not view_counts.size:
                 return self.filters.get("min_views", 10000)
             
-            # Sort view counts to calculate percentiles
-            view_counts.sort()
+            # Select the median and 75th percentile positions in O(N) instead of a full sort
+            median_index = view_counts.size // 2
+            percentile_75_index = int(view_counts.size * 0.75)
+            partitioned = np.partition(view_counts, (median_index, percentile_75_index))
             
             # Calculate various statistics
-            avg_views = sum(view_counts) / len(view_counts)
-            median_views = view_counts[len(view_counts) // 2]
-            
-            # Calculate 75th percentile of views
-            percentile_75_index = int(len(view_counts) * 0.75)
-            percentile_75 = view_counts[percentile_75_index]
-            
-            # Determine channel size category based on average views
-            if avg_views < 20000:
-                channel_size = "small"
-            elif avg_views < 100000:
-                channel_size = "medium"
-            else:
-                channel_size = "large"
-            
-            # Set threshold based on channel size
-            if channel_size == "small":
-                # For small channels, set threshold at 70% of average
-                dynamic_threshold = int(avg_views * 0.7)
-                min_bound = 3000  # Lower minimum for small channels
-            elif channel_size == "medium":
-                # For medium channels, use the median as baseline
-                dynamic_threshold = int(median_views * 0.8)
-                min_bound = 8000
-            else:
-                # For large channels, use 75th percentile as baseline
-                dynamic_threshold = int(percentile_75 * 0.7)
-                min_bound = 15000
+            avg_views = float(view_counts.mean())
+            median_views = int(partitioned[median_index])
+            percentile_75 = int(partitioned[percentile_75_index])
+            
+            # Determine channel size category (0=small, 1=medium, 2=large) based on average views
+            bucket = int(np.digitize(avg_views, CHANNEL_SIZE_BOUNDS))
+            channel_size = CHANNEL_SIZES[bucket]
+            
+            # Small channels scale the average, medium the median, large the 75th percentile
+            baseline = (avg_views, median_views, percentile_75)[bucket]
+            dynamic_threshold = int(baseline * THRESHOLD_SCALES[bucket])
+            min_bound = THRESHOLD_MIN_BOUNDS[bucket]
             
             # Set minimum and maximum bounds to prevent extreme values
             max_bound = 500000  # Don't require more than 500K views
@@ -415,39 +539,79 @@ class ContentAnalyzer:
         if not videos:
             return []
         
-        filtered_videos = []
+        views, durations, scores = self._policy_metrics(videos)
+        mask = self._content_policy_mask(videos, channel_name, views, durations, scores)
+        return [videos[i] for i in np.flatnonzero(mask)]
+    
+    def _policy_metrics(self, videos: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Extract the metrics the content policy needs in a single pass.
+        
+        Args:
+            videos (List[Dict]): List of video data
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (views, durations, engagement scores) per video
+        """
+        metrics = np.array([(*_extract_stats(video), _extract_duration(video)) for video in videos], dtype=float)
+        views, likes, comments, shares, durations = metrics.T
+        scores = self._engagement_scores(videos, views, likes, comments, shares)
+        return views, durations, scores
+    
+    def _content_policy_mask(self, videos: List[Dict], channel_name: str, views: np.ndarray,
+                             durations: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """
+        Apply the content policy with dynamic thresholds as boolean masks.
         
+        Args:
+            videos (List[Dict]): List of video data, aligned with the metric arrays
+            channel_name (str): Name of the channel for logging and threshold calculation
+            views, durations, scores (np.ndarray): Per-video metrics from _policy_metrics
+            
+        Returns:
+            np.ndarray: True for each video that passes every filter
+        """
         # Calculate dynamic view threshold for this channel
         dynamic_view_threshold = self.calculate_dynamic_view_threshold(videos, channel_name)
         
-        for video in videos:
-            # Duration checks
-            duration = float(video.get('video', {}).get('duration', 0))
-            if duration < self.filters.get("min_duration", 0) or duration > self.filters.get("max_duration", 60):
-                logger.debug(f"Filtered out video (duration {duration}s): {video.get('desc', 'Unknown')}")
-                continue
-            
-            # View count threshold - using dynamic threshold
-            views = int(video.get('stats', {}).get('playCount', 0))
-            if views < dynamic_view_threshold:
-                logger.debug(f"Filtered out video (only {views} views, below threshold {dynamic_view_threshold}): {video.get('desc', 'Unknown')}")
-                continue
-            
-            # Engagement rate check
-            engagement_rate = self.calculate_engagement_score(video)
-            if engagement_rate < self.filters.get("min_engagement_rate", 0):
-                logger.debug(f"Filtered out video (low engagement {engagement_rate}): {video.get('desc', 'Unknown')}")
-                continue
-            
-            # Check excluded hashtags
-            caption = video.get('desc', '')
-            excluded_tags = self.filters.get("exclude_hashtags", [])
-            if any(tag.lower() in caption.lower() for tag in excluded_tags):
-                logger.debug(f"Filtered out video (excluded hashtags): {video.get('desc', 'Unknown')}")
-                continue
-            
-            # Passed all filters
-            filtered_videos.append(video)
-        
-        logger.info(f"Channel {channel_name}: Filtered to {len(filtered_videos)} videos from {len(videos)} based on content policy")
-        return filtered_videos 
\ No newline at end of file
+        min_duration = self.filters.get("min_duration", 0)
+        max_duration = self.filters.get("max_duration", 60)
+        min_engagement = self.filters.get("min_engagement_rate", 0)
+        excluded_tags = tuple(tag.lower() for tag in self.filters.get("exclude_hashtags", []))
+        
+        duration_ok = (durations >= min_duration) & (durations <= max_duration)
+        views_ok = views >= dynamic_view_threshold
+        engagement_ok = scores >= min_engagement
+        
+        if excluded_tags:
+            # For long exclusion lists a single compiled alternation beats testing each tag
+            if len(excluded_tags) > 20:
+                excluded_re = re.compile('|'.join(map(re.escape, excluded_tags)))
+                is_excluded = lambda caption: excluded_re.search(caption) is not None
+            else:
+                is_excluded = lambda caption: any(tag in caption for tag in excluded_tags)
+            tags_ok = np.fromiter(
+                (not is_excluded(video.get('desc', '').lower()) for video in videos),
+                dtype=bool,
+                count=len(videos)
+            )
+        else:
+            tags_ok = np.ones(len(videos), dtype=bool)
+        
+        mask = duration_ok & views_ok & tags_ok & engagement_ok
+        
+        # Report the first failed check for each filtered video
+        if logger.isEnabledFor(logging.DEBUG):
+            for i in np.flatnonzero(~mask):
+                desc = videos[i].get('desc', 'Unknown')
+                if not duration_ok[i]:
+                    logger.debug(f"Filtered out video (duration {durations[i]}s): {desc}")
+                elif not views_ok[i]:
+                    logger.debug(f"Filtered out video (only {int(views[i])} views, below threshold {dynamic_view_threshold}): {desc}")
+                elif not tags_ok[i]:
+                    logger.debug(f"Filtered out video (excluded hashtags): {desc}")
+                else:
+                    logger.debug(f"Filtered out video (low engagement {scores[i]}): {desc}")
+        
+        logger.info(f"Channel {channel_name}: Filtered to {int(mask.sum())} videos from {len(videos)} based on content policy")
+        return mask 
\ No newline at end of file
@@ -4,21 +4,35 @@ Dashboard for TikTok to YouTube Bridge
 Provides real-time monitoring and control of the bridge application.
 """
 import os
+import atexit
+import functools
+import itertools
+import gzip
+import hashlib
 import json
+import re
 import logging
 import sqlite3
 import threading
 import time
 import psutil
+import orjson
+import queue
+import random
+import sched
+import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from flask import Flask, render_template, jsonify, request, redirect, url_for
+from flask import Flask, Response, render_template, jsonify, request, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.serving import run_simple
 import config
 from youtube_uploader import YouTubeUploader
 from video_history import VideoHistory
 import math
-from content_analyzer import ContentAnalyzer
+import numpy as np
 from pathlib import Path
 
 # Configure logging
@@ -32,10 +46,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger("dashboard")
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson, so jsonify() skips the stdlib encoder."""
+    
+    # Datetimes go through DefaultJSONProvider.default to keep Flask's HTTP date format
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype=self.mimetype
+        )
+
 # Initialize Flask app
 app = Flask(__name__, 
             template_folder=os.path.join(os.path.dirname(__file__), 'dashboard/templates'),
             static_folder=os.path.join(os.path.dirname(__file__), 'dashboard/static'))
+app.json = OrjsonProvider(app)
 
 # Database setup
 DB_PATH = os.path.join(os.path.dirname(__file__), 'dashboard.db')
@@ -43,12 +77,273 @@ DB_PATH = os.path.join(os.path.dirname(__file__), 'dashboard.db')
 # Global variable to track if bridge process is running
 bridge_process_status = {
     "status": "stopped",
-    "next_run": None
+    "next_run": None,
+    "pid": None
 }
 
+# Group names are passed to main.py as an argument, so only allow plain names
+GROUP_NAME_RE = re.compile(r'^[A-Za-z0-9_-]+$')
+
+# main.py's log line for a group run, in the new (channels-<group>.json) and legacy formats
+GROUP_RUN_RE = re.compile(
+    r'Using channel group (\S+) configuration|Using legacy channel group (\S+) configuration: channels\2\.json'
+)
+
+# Leading asctime of a log line ('YYYY-MM-DD HH:MM:SS,mmm'), milliseconds ignored
+LOG_TIMESTAMP_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2})')
+
+# YouTube video IDs are URL-safe base64; anything else is rejected before embedding
+YOUTUBE_ID_RE = re.compile(r'^[A-Za-z0-9_-]{6,15}$')
+
+EMBED_HTML_TEMPLATE = '''
+    <iframe 
+        width="100%" 
+        height="315" 
+        src="https://www.youtube.com/embed/{youtube_id}" 
+        frameborder="0" 
+        allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" 
+        allowfullscreen>
+    </iframe>
+    '''
+
+# Metrics are re-fetched for a video once they are this old; the growth
+# charts aggregate per day, so hourly refreshes only add duplicate points
+METRICS_REFRESH_HOURS = 12
+
+# videos.list accepts at most 50 IDs per call; batches are fetched in parallel
+METRICS_BATCH_SIZE = 50
+METRICS_FETCH_WORKERS = 8
+
+# Upper bounds for the days/limit/lines query parameters
+MAX_QUERY_DAYS = 365
+MAX_QUERY_LIMIT = 200
+MAX_LOG_LINES = 5000
+
+# Upload history written by main.py (VideoHistory's default location)
+VIDEO_HISTORY_FILE = "data/video_history.json"
+
+# Rows removed per transaction by /api/cleanup, and the fixed statements it runs
+# so the connection's statement cache reuses them
+CLEANUP_BATCH_SIZE = 5000
+CLEANUP_DELETE_SQL = tuple(
+    f'''
+    DELETE FROM {table} WHERE rowid IN (
+        SELECT rowid FROM {table} WHERE timestamp < datetime("now", ?) LIMIT ?
+    )
+    '''
+    for table in ('processing_stats', 'metrics_history')
+)
+
+# JSON responses smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+# Last system status sample, reused by request handlers for _SYS_TTL seconds
+_sys_cache = {"ts": 0, "vals": None}
+_SYS_TTL = 5.0
+
+# Shared writer connection (SQLite serializes writers anyway) and a pool of
+# read-only connections reused across request threads
+_WRITER_CONN = None
+_writer_lock = threading.RLock()
+READ_POOL_SIZE = 8
+_read_pool = queue.LifoQueue(maxsize=READ_POOL_SIZE)
+
+# History inserts (channel group snapshots, thresholds, cleanup runs) are
+# written by a single background thread instead of on the request path
+_history_queue = queue.Queue()
+_history_thread = None
+_history_thread_lock = threading.Lock()
+HISTORY_WRITE_BATCH = 100
+
+def get_conn(read_only=False, **kwargs):
+    """
+    Open a connection to the dashboard database.
+    
+    WAL mode is stored in the database file by init_db, but the remaining
+    pragmas only apply to the connection that sets them.
+    
+    Args:
+        read_only (bool): Open the database in read-only mode
+        **kwargs: Extra arguments passed to sqlite3.connect
+    
+    Returns:
+        sqlite3.Connection: Configured database connection
+    """
+    if read_only:
+        conn = sqlite3.connect(Path(os.path.abspath(DB_PATH)).as_uri() + "?mode=ro", uri=True, **kwargs)
+    else:
+        conn = sqlite3.connect(DB_PATH, **kwargs)
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+def _now_str(t=None):
+    """
+    Format a local time as a database timestamp.
+    
+    Args:
+        t (time.struct_time, optional): Time to format, defaults to now
+        
+    Returns:
+        str: Timestamp as 'YYYY-MM-DD HH:MM:SS'
+    """
+    return time.strftime('%Y-%m-%d %H:%M:%S', t or time.localtime())
+
+def ttl_cache(seconds, maxsize=128):
+    """
+    Cache a function's result per arguments for a number of seconds.
+    
+    Args:
+        seconds (float): How long a cached result stays valid
+        maxsize (int): Entries kept before expired ones are purged
+        
+    Returns:
+        callable: Decorator; the wrapped function gets a cache_clear() method
+    """
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and now - entry[0] < seconds:
+                    return entry[1]
+            
+            value = func(*args, **kwargs)
+            with lock:
+                if len(cache) >= maxsize:
+                    for stale_key in [k for k, (ts, _) in cache.items() if now - ts >= seconds]:
+                        del cache[stale_key]
+                    if len(cache) >= maxsize:
+                        cache.clear()
+                cache[key] = (now, value)
+            return value
+        
+        def cache_clear():
+            with lock:
+                cache.clear()
+        
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+@contextmanager
+def write_conn():
+    """
+    Run a block of writes as one transaction on the shared writer connection.
+    
+    Nested blocks on the same thread join the outer transaction.
+    
+    Yields:
+        sqlite3.Connection: The writer connection
+    """
+    global _WRITER_CONN
+    with _writer_lock:
+        if _WRITER_CONN is None:
+            _WRITER_CONN = get_conn(check_same_thread=False, isolation_level=None)
+            _WRITER_CONN.row_factory = sqlite3.Row
+        conn = _WRITER_CONN
+        outer = not conn.in_transaction
+        if outer:
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            if outer:
+                conn.execute("ROLLBACK")
+            raise
+        if outer:
+            conn.execute("COMMIT")
+
+def dict_factory(cursor, row):
+    """
+    Row factory returning each row as a plain dict keyed by column name.
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor that produced the row
+        row (tuple): Raw row values
+        
+    Returns:
+        dict: Column name to value mapping
+    """
+    return {column[0]: row[i] for i, column in enumerate(cursor.description)}
+
+@contextmanager
+def read_conn():
+    """
+    Borrow a read-only connection from the pool, opening one if none are idle.
+    
+    Yields:
+        sqlite3.Connection: Read-only connection returning rows as dicts
+    """
+    try:
+        conn = _read_pool.get_nowait()
+    except queue.Empty:
+        conn = get_conn(read_only=True, isolation_level=None, check_same_thread=False)
+        conn.row_factory = dict_factory
+    try:
+        yield conn
+    finally:
+        try:
+            _read_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+def queue_history_write(sql, rows, on_commit=None):
+    """
+    Hand rows to the background history writer and return immediately.
+    
+    Args:
+        sql (str): INSERT statement run with executemany
+        rows (list): Parameter tuples, one per row
+        on_commit (callable): Optional callback run once the rows are committed
+    """
+    global _history_thread
+    with _history_thread_lock:
+        if _history_thread is None:
+            _history_thread = threading.Thread(target=_history_writer, daemon=True)
+            _history_thread.start()
+            # Let pending rows land before the interpreter exits
+            atexit.register(_history_queue.join)
+    _history_queue.put((sql, rows, on_commit))
+
+def _history_writer():
+    """Commit queued history writes, batching whatever is pending into one transaction."""
+    while True:
+        batch = [_history_queue.get()]
+        while len(batch) < HISTORY_WRITE_BATCH:
+            try:
+                batch.append(_history_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        try:
+            with write_conn() as conn:
+                for sql, rows, _ in batch:
+                    conn.executemany(sql, rows)
+            for _, _, on_commit in batch:
+                if on_commit:
+                    on_commit()
+        except Exception as e:
+            logger.error(f"Error writing history rows: {str(e)}")
+        finally:
+            for _ in batch:
+                _history_queue.task_done()
+
 def init_db():
     """Initialize the SQLite database for dashboard metrics."""
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_conn() as conn:
+        # WAL lets the dashboard routes read while the monitor thread writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        
         cursor = conn.cursor()
         
         # Create tables if they don't exist
@@ -56,6 +351,7 @@ def init_db():
         CREATE TABLE IF NOT EXISTS processing_stats (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp TEXT,
+            date_day TEXT,
             videos_processed INTEGER,
             videos_uploaded INTEGER,
             videos_failed INTEGER,
@@ -187,6 +483,86 @@ def init_db():
         )
         ''')
         
+        # One metrics row per YouTube video so updates can be a single UPSERT;
+        # drop duplicates left by older versions before enforcing it
+        cursor.execute('''
+        DELETE FROM youtube_metrics
+        WHERE id NOT IN (SELECT MAX(id) FROM youtube_metrics GROUP BY youtube_id)
+        ''')
+        cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_youtube_metrics_youtube_id
+        ON youtube_metrics (youtube_id)
+        ''')
+        
+        # One processing_stats row per day, keyed by date_day (added to older
+        # databases here and backfilled, merging any duplicate days)
+        cursor.execute('PRAGMA table_info(processing_stats)')
+        if 'date_day' not in [column[1] for column in cursor.fetchall()]:
+            cursor.execute('ALTER TABLE processing_stats ADD COLUMN date_day TEXT')
+        cursor.execute('''
+        UPDATE processing_stats SET date_day = substr(timestamp, 1, 10) WHERE date_day IS NULL
+        ''')
+        cursor.execute('''
+        UPDATE processing_stats SET
+            videos_processed = (SELECT SUM(videos_processed) FROM processing_stats p WHERE p.date_day = processing_stats.date_day),
+            videos_uploaded = (SELECT SUM(videos_uploaded) FROM processing_stats p WHERE p.date_day = processing_stats.date_day),
+            videos_failed = (SELECT SUM(videos_failed) FROM processing_stats p WHERE p.date_day = processing_stats.date_day),
+            channels_processed = (SELECT SUM(channels_processed) FROM processing_stats p WHERE p.date_day = processing_stats.date_day)
+        WHERE id IN (SELECT MIN(id) FROM processing_stats GROUP BY date_day HAVING COUNT(*) > 1)
+        ''')
+        cursor.execute('''
+        DELETE FROM processing_stats
+        WHERE id NOT IN (SELECT MIN(id) FROM processing_stats GROUP BY date_day)
+        ''')
+        cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_processing_stats_date_day
+        ON processing_stats (date_day)
+        ''')
+        
+        # One row per setting so saving config can be a single UPSERT
+        cursor.execute('''
+        DELETE FROM config_settings
+        WHERE id NOT IN (SELECT MAX(id) FROM config_settings GROUP BY category, setting_key)
+        ''')
+        cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_config_settings_category_key
+        ON config_settings (category, setting_key)
+        ''')
+        
+        # Indexes for the upload lookups and the metrics history range queries
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_uploads_youtube_id
+        ON uploads (youtube_id)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_uploads_status_youtube_id
+        ON uploads (status, youtube_id)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_metrics_history_timestamp
+        ON metrics_history (timestamp)
+        ''')
+        
+        # Indexes for the date-windowed dashboard queries
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_uploads_timestamp_status_channel
+        ON uploads (timestamp, status, channel, youtube_id)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_metrics_history_youtube_id_timestamp
+        ON metrics_history (youtube_id, timestamp)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_processing_stats_timestamp
+        ON processing_stats (timestamp)
+        ''')
+        
+        # Index for the latest cleanup operations on the cleanup panel
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_file_cleanup_timestamp
+        ON file_cleanup (timestamp)
+        ''')
+        
         conn.commit()
         logger.info("Database initialized")
 
@@ -202,20 +578,30 @@ def update_token_status():
         expiry = None
         has_refresh_token = 0
     
-    with sqlite3.connect(DB_PATH) as conn:
+    with write_conn() as conn:
         cursor = conn.cursor()
         cursor.execute('''
         INSERT INTO token_status (timestamp, is_valid, expiry, has_refresh_token, message)
         VALUES (?, ?, ?, ?, ?)
-        ''', (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 1 if is_valid else 0, 
+        ''', (_now_str(), 1 if is_valid else 0, 
               expiry, has_refresh_token, message))
-        conn.commit()
     
     logger.info(f"Token status updated: {is_valid}, {message}")
     return is_valid, message, expiry, has_refresh_token
 
-def update_system_status():
-    """Update system status in the database with real system metrics."""
+def update_system_status(force=False):
+    """
+    Update system status in the database with real system metrics.
+    
+    Args:
+        force (bool): Always take a new sample instead of reusing a recent one
+        
+    Returns:
+        tuple: (status, cpu_usage, memory_usage, disk_usage, next_run)
+    """
+    if not force and _sys_cache["vals"] is not None and time.time() - _sys_cache["ts"] < _SYS_TTL:
+        return _sys_cache["vals"]
+    
     cpu_usage = psutil.cpu_percent()
     memory_usage = psutil.virtual_memory().percent
     
@@ -226,24 +612,62 @@ def update_system_status():
     status = bridge_process_status["status"]
     next_run = bridge_process_status["next_run"]
     
-    with sqlite3.connect(DB_PATH) as conn:
+    with write_conn() as conn:
         cursor = conn.cursor()
         cursor.execute('''
         INSERT INTO system_status (timestamp, status, cpu_usage, memory_usage, disk_usage, next_run)
         VALUES (?, ?, ?, ?, ?, ?)
-        ''', (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), status, cpu_usage, memory_usage, disk_usage, next_run))
-        conn.commit()
+        ''', (_now_str(), status, cpu_usage, memory_usage, disk_usage, next_run))
     
     logger.info(f"System status updated: CPU {cpu_usage}%, Memory {memory_usage}%, Disk {disk_usage}%")
-    return status, cpu_usage, memory_usage, disk_usage, next_run
+    vals = (status, cpu_usage, memory_usage, disk_usage, next_run)
+    _sys_cache["ts"] = time.time()
+    _sys_cache["vals"] = vals
+    return vals
+
+@functools.lru_cache(maxsize=32)
+def _parse_json_file(path, mtime_ns):
+    """Parse a JSON file; mtime_ns is only part of the cache key."""
+    return orjson.loads(Path(path).read_bytes())
+
+def load_json_file(path):
+    """
+    Load a JSON config file, reparsing it only when its modification time changes.
+    
+    The parsed data is shared between callers and must not be modified.
+    
+    Args:
+        path (str): Path of the JSON file
+        
+    Returns:
+        Parsed JSON data
+    """
+    return _parse_json_file(path, os.stat(path).st_mtime_ns)
+
+@functools.lru_cache(maxsize=1)
+def _load_video_history(mtime_ns):
+    """Load the video history; mtime_ns is only part of the cache key."""
+    return VideoHistory(VIDEO_HISTORY_FILE)
+
+def get_video_history():
+    """
+    Get a shared VideoHistory, reloaded only after main.py rewrites the history file.
+    
+    Returns:
+        VideoHistory: Read-only view of the upload history
+    """
+    try:
+        mtime_ns = os.stat(VIDEO_HISTORY_FILE).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return _load_video_history(mtime_ns)
 
 def get_channels_from_file():
     """Read the channels.json file and return the channels configuration."""
     channels_file = os.path.join(os.path.dirname(__file__), 'channels.json')
     if os.path.exists(channels_file):
         try:
-            with open(channels_file, 'r') as f:
-                return json.load(f)
+            return load_json_file(channels_file)
         except Exception as e:
             logger.error(f"Error reading channels.json: {str(e)}")
     return []
@@ -252,8 +676,9 @@ def save_channels_to_file(channels_data):
     """Save the channels configuration to the channels.json file."""
     channels_file = os.path.join(os.path.dirname(__file__), 'channels.json')
     try:
-        with open(channels_file, 'w') as f:
-            json.dump(channels_data, f, indent=4)
+        Path(channels_file).write_bytes(
+            orjson.dumps(channels_data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        )
         logger.info("Channels configuration saved")
         return True
     except Exception as e:
@@ -270,43 +695,42 @@ def get_config_settings():
     }
     return settings
 
+def _flatten_settings(settings_dict, category):
+    """
+    Flatten nested settings into rows, nesting categories as "parent.child".
+    
+    Args:
+        settings_dict (dict): Possibly nested settings
+        category (str): Category of the top-level settings
+        
+    Returns:
+        list: (category, key, value_str) tuples for every non-dict value
+    """
+    rows = []
+    stack = [(settings_dict, category)]
+    while stack:
+        current, current_category = stack.pop()
+        for key, value in current.items():
+            if isinstance(value, dict):
+                stack.append((value, f"{current_category}.{key}"))
+            else:
+                rows.append((current_category, key, str(value)))
+    return rows
+
 def save_config_to_db(settings_dict, category):
     """Save configuration settings to the database."""
-    with sqlite3.connect(DB_PATH) as conn:
+    timestamp = _now_str()
+    rows = [(timestamp, key, value_str, cat) for cat, key, value_str in _flatten_settings(settings_dict, category)]
+    
+    with write_conn() as conn:
         cursor = conn.cursor()
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        for key, value in settings_dict.items():
-            if isinstance(value, dict):
-                # Recursively save nested dictionaries
-                save_config_to_db(value, f"{category}.{key}")
-            else:
-                # Convert value to string for storage
-                value_str = str(value)
-                
-                # Check if this setting already exists
-                cursor.execute('''
-                SELECT id FROM config_settings 
-                WHERE setting_key = ? AND category = ?
-                ''', (key, category))
-                
-                existing = cursor.fetchone()
-                
-                if existing:
-                    # Update existing setting
-                    cursor.execute('''
-                    UPDATE config_settings 
-                    SET timestamp = ?, setting_value = ? 
-                    WHERE setting_key = ? AND category = ?
-                    ''', (timestamp, value_str, key, category))
-                else:
-                    # Insert new setting
-                    cursor.execute('''
-                    INSERT INTO config_settings (timestamp, setting_key, setting_value, category)
-                    VALUES (?, ?, ?, ?)
-                    ''', (timestamp, key, value_str, category))
-        
-        conn.commit()
+        cursor.executemany('''
+        INSERT INTO config_settings (timestamp, setting_key, setting_value, category)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(category, setting_key) DO UPDATE SET
+            timestamp = excluded.timestamp,
+            setting_value = excluded.setting_value
+        ''', rows)
     logger.info(f"Saved {category} settings to database")
 
 def apply_config_changes(category, settings):
@@ -320,52 +744,105 @@ def apply_config_changes(category, settings):
         logger.error(f"Error applying config changes: {str(e)}")
         return False
 
+def fetch_youtube_metrics(youtube_ids):
+    """
+    Fetch YouTube metrics in API-sized batches, several batches at a time.
+    
+    Authentication happens once here; the API client is not thread-safe, so each
+    worker thread gets its own client built from the shared credentials.
+    
+    Args:
+        youtube_ids (list): YouTube video IDs
+        
+    Returns:
+        dict: YouTube ID to metrics, as returned by YouTubeUploader.get_youtube_metrics
+    """
+    batches = [youtube_ids[i:i + METRICS_BATCH_SIZE] for i in range(0, len(youtube_ids), METRICS_BATCH_SIZE)]
+    uploader = YouTubeUploader()
+    local = threading.local()
+    
+    def fetch(batch):
+        worker = getattr(local, 'uploader', None)
+        if worker is None:
+            worker = local.uploader = uploader.clone_for_thread()
+        return worker.get_youtube_metrics(batch)
+    
+    metrics = {}
+    with ThreadPoolExecutor(max_workers=min(METRICS_FETCH_WORKERS, len(batches))) as executor:
+        for batch_metrics in executor.map(fetch, batches):
+            metrics.update(batch_metrics)
+    return metrics
+
 def update_youtube_metrics():
-    """Update YouTube metrics for all uploaded videos."""
+    """Update YouTube metrics for uploaded videos that are new or due for a refresh."""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.row_factory = sqlite3.Row
+        refresh_before = _now_str(time.localtime(time.time() - METRICS_REFRESH_HOURS * 3600))
+        
+        with read_conn() as conn:
             cursor = conn.cursor()
             
-            # Get all successful uploads with YouTube IDs
+            # Get successful uploads with YouTube IDs whose metrics are missing or stale
             cursor.execute('''
-            SELECT DISTINCT youtube_id 
-            FROM uploads 
-            WHERE status = 'success' AND youtube_id IS NOT NULL
-            ''')
+            SELECT DISTINCT u.youtube_id 
+            FROM uploads u
+            LEFT JOIN youtube_metrics ym ON ym.youtube_id = u.youtube_id
+            WHERE u.status = 'success' AND u.youtube_id IS NOT NULL
+              AND (ym.timestamp IS NULL OR ym.timestamp < ?)
+            ''', (refresh_before,))
             
             rows = cursor.fetchall()
             youtube_ids = [row['youtube_id'] for row in rows]
             
             if not youtube_ids:
-                logger.info("No YouTube videos found to update metrics")
+                logger.info("No YouTube videos need a metrics update")
                 return False
-                
-            # Get metrics for these videos
-            uploader = YouTubeUploader()
-            metrics = uploader.get_youtube_metrics(youtube_ids)
             
-            # Get original TikTok metrics from video history
-            history = VideoHistory()
+            # Map every YouTube ID to its TikTok video and channel in one query
+            # (first upload wins, as with the old per-video lookup)
+            cursor.execute('''
+            SELECT youtube_id, video_id, channel
+            FROM uploads
+            WHERE youtube_id IS NOT NULL
+            ORDER BY id
+            ''')
             
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            upload_map = {}
+            for row in cursor.fetchall():
+                upload_map.setdefault(row['youtube_id'], (row['video_id'], row['channel']))
+        
+        # Get metrics for these videos (outside the write lock, this hits the API)
+        metrics = fetch_youtube_metrics(youtube_ids)
+        
+        # Get original TikTok metrics from video history
+        history = get_video_history()
+        
+        # Index each channel's history by video ID once, instead of scanning it per video
+        channel_index = {}
+        
+        timestamp = _now_str()
+        
+        with write_conn() as conn:
+            cursor = conn.cursor()
+            
+            youtube_metrics_rows = []
+            metrics_history_rows = []
             
-            # For each video, update the metrics
+            # Collect the rows for each video, then write them in two batches
             for youtube_id, yt_metrics in metrics.items():
                 # Get the TikTok video ID for this YouTube video
-                cursor.execute('''
-                SELECT video_id, channel FROM uploads WHERE youtube_id = ?
-                ''', (youtube_id,))
-                
-                upload_row = cursor.fetchone()
-                if not upload_row:
+                upload = upload_map.get(youtube_id)
+                if not upload:
                     continue
                     
-                tiktok_video_id = upload_row['video_id']
-                tiktok_channel = upload_row['channel']
+                tiktok_video_id, tiktok_channel = upload
                 
                 # Get TikTok metrics from history
-                channel_history = history.get_channel_history(tiktok_channel)
+                videos_by_id = channel_index.get(tiktok_channel)
+                if videos_by_id is None:
+                    videos_by_id = {}
+                    for video in history.get_channel_history(tiktok_channel):
+                        videos_by_id.setdefault(video.get('video_id'), video)
+                    channel_index[tiktok_channel] = videos_by_id
                 
                 tiktok_metrics = {
                     "views": 0,
@@ -375,123 +852,176 @@ def update_youtube_metrics():
                 }
                 
                 # Find this video in the history
-                for video in channel_history:
-                    if video.get('video_id') == tiktok_video_id:
-                        tiktok_metrics = video.get('metrics', tiktok_metrics)
-                        break
-                
-                # Store metrics in the database
-                cursor.execute('''
-                SELECT id FROM youtube_metrics WHERE youtube_id = ?
-                ''', (youtube_id,))
+                video = videos_by_id.get(tiktok_video_id)
+                if video is not None:
+                    tiktok_metrics = video.get('metrics', tiktok_metrics)
                 
-                existing = cursor.fetchone()
+                yt_views = yt_metrics.get('views', 0)
+                yt_likes = yt_metrics.get('likes', 0)
+                yt_comments = yt_metrics.get('comments', 0)
+                tk_views = tiktok_metrics.get('views', 0)
+                tk_likes = tiktok_metrics.get('likes', 0)
+                tk_comments = tiktok_metrics.get('comments', 0)
+                tk_shares = tiktok_metrics.get('shares', 0)
                 
-                if existing:
-                    # Update existing record
-                    cursor.execute('''
-                    UPDATE youtube_metrics 
-                    SET timestamp = ?, views = ?, likes = ?, comments = ?, favorites = ?,
-                        tiktok_views = ?, tiktok_likes = ?, tiktok_comments = ?, tiktok_shares = ?
-                    WHERE id = ?
-                    ''', (
-                        timestamp, 
-                        yt_metrics.get('views', 0), 
-                        yt_metrics.get('likes', 0), 
-                        yt_metrics.get('comments', 0),
-                        yt_metrics.get('favorites', 0),
-                        tiktok_metrics.get('views', 0),
-                        tiktok_metrics.get('likes', 0),
-                        tiktok_metrics.get('comments', 0),
-                        tiktok_metrics.get('shares', 0),
-                        existing['id']
-                    ))
-                else:
-                    # Insert new record
-                    cursor.execute('''
-                    INSERT INTO youtube_metrics (
-                        timestamp, youtube_id, views, likes, comments, favorites,
-                        tiktok_views, tiktok_likes, tiktok_comments, tiktok_shares
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        timestamp,
-                        youtube_id,
-                        yt_metrics.get('views', 0),
-                        yt_metrics.get('likes', 0),
-                        yt_metrics.get('comments', 0),
-                        yt_metrics.get('favorites', 0),
-                        tiktok_metrics.get('views', 0),
-                        tiktok_metrics.get('likes', 0),
-                        tiktok_metrics.get('comments', 0),
-                        tiktok_metrics.get('shares', 0)
-                    ))
-                
-                # Add entry to metrics history
-                cursor.execute('''
-                INSERT INTO metrics_history (
-                    timestamp, youtube_id, platform, views, likes, comments, shares
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    timestamp,
-                    youtube_id,
-                    'youtube',
-                    yt_metrics.get('views', 0),
-                    yt_metrics.get('likes', 0),
-                    yt_metrics.get('comments', 0),
-                    0  # YouTube doesn't provide shares
+                youtube_metrics_rows.append((
+                    timestamp, youtube_id, yt_views, yt_likes, yt_comments,
+                    yt_metrics.get('favorites', 0), tk_views, tk_likes, tk_comments, tk_shares
                 ))
                 
-                # Add entry for TikTok metrics history
-                cursor.execute('''
-                INSERT INTO metrics_history (
-                    timestamp, youtube_id, platform, views, likes, comments, shares
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    timestamp,
-                    youtube_id,
-                    'tiktok',
-                    tiktok_metrics.get('views', 0),
-                    tiktok_metrics.get('likes', 0),
-                    tiktok_metrics.get('comments', 0),
-                    tiktok_metrics.get('shares', 0)
-                ))
+                # YouTube doesn't provide shares
+                metrics_history_rows.append((timestamp, youtube_id, 'youtube', yt_views, yt_likes, yt_comments, 0))
+                metrics_history_rows.append((timestamp, youtube_id, 'tiktok', tk_views, tk_likes, tk_comments, tk_shares))
             
-            conn.commit()
-            logger.info(f"Updated YouTube metrics for {len(metrics)} videos")
-            return True
+            # Store metrics in the database
+            cursor.executemany('''
+            INSERT INTO youtube_metrics (
+                timestamp, youtube_id, views, likes, comments, favorites,
+                tiktok_views, tiktok_likes, tiktok_comments, tiktok_shares
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(youtube_id) DO UPDATE SET
+                timestamp = excluded.timestamp,
+                views = excluded.views,
+                likes = excluded.likes,
+                comments = excluded.comments,
+                favorites = excluded.favorites,
+                tiktok_views = excluded.tiktok_views,
+                tiktok_likes = excluded.tiktok_likes,
+                tiktok_comments = excluded.tiktok_comments,
+                tiktok_shares = excluded.tiktok_shares
+            ''', youtube_metrics_rows)
+            
+            # Add entries to metrics history
+            cursor.executemany('''
+            INSERT INTO metrics_history (
+                timestamp, youtube_id, platform, views, likes, comments, shares
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', metrics_history_rows)
+            
+        clear_response_caches()
+        logger.info(f"Updated YouTube metrics for {len(metrics)} videos")
+        return True
             
     except Exception as e:
         logger.error(f"Error updating YouTube metrics: {str(e)}")
         return False
 
+def _run_periodic(scheduler, job, interval, jitter=0):
+    """
+    Run a monitor job and schedule its next run.
+    
+    Args:
+        scheduler (sched.scheduler): Scheduler driving the monitor jobs
+        job (callable): Job to run
+        interval (float): Seconds between runs
+        jitter (float): Maximum random offset added to each interval
+    """
+    try:
+        job()
+    except Exception as e:
+        logger.error(f"Error in background monitor: {str(e)}")
+    
+    scheduler.enter(interval + random.uniform(-jitter, jitter), 1, _run_periodic,
+                    (scheduler, job, interval, jitter))
+
 def background_monitor():
     """Background thread to continuously monitor system and token status."""
-    while True:
-        try:
-            # Update system stats
-            update_system_status()
-            
-            # Update token status (less frequently)
-            if int(time.time()) % 3600 < 60:  # Once every hour
-                update_token_status()
-                
-            # Update YouTube metrics (less frequently)
-            if int(time.time()) % 3600 < 120:  # Once every hour
-                update_youtube_metrics()
-                
-        except Exception as e:
-            logger.error(f"Error in background monitor: {str(e)}")
-        
-        # Sleep for a while before next update
-        time.sleep(30)
+    scheduler = sched.scheduler(time.monotonic, time.sleep)
+    
+    # Update system stats every 30 seconds
+    scheduler.enter(0, 1, _run_periodic, (scheduler, lambda: update_system_status(force=True), 30))
+    
+    # Update token status hourly; run_dashboard already checked it on startup
+    scheduler.enter(3600, 1, _run_periodic, (scheduler, update_token_status, 3600))
+    
+    # Update YouTube metrics hourly, jittered so it drifts away from the token check
+    scheduler.enter(0, 1, _run_periodic, (scheduler, update_youtube_metrics, 3600, 120))
+    
+    # Sleeps until the next job is due
+    scheduler.run()
+
+def clear_response_caches():
+    """Drop cached API payloads after the underlying data changes."""
+    compute_analytics.cache_clear()
+    compute_metrics.cache_clear()
+    compute_metrics_growth.cache_clear()
+    compute_dashboard_summary.cache_clear()
+
+def json_encoded(func):
+    """
+    Make a function return its result already serialized with orjson.
+    
+    Applied under ttl_cache so cached payloads are stored as bytes and are
+    not re-encoded on every request.
+    
+    Args:
+        func (callable): Function returning JSON-serializable data
+        
+    Returns:
+        callable: Wrapped function returning bytes
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return orjson.dumps(func(*args, **kwargs))
+    return wrapper
+
+def json_response(payload):
+    """
+    Serialize a payload with orjson, which is much faster than jsonify.
+    
+    Bodies of at least GZIP_MIN_SIZE bytes are gzipped when the client accepts it.
+    Responses carry a weak ETag of the JSON body, and polls that send back a
+    matching If-None-Match get an empty 304.
+    
+    Args:
+        payload: JSON-serializable data, or bytes that are already encoded
+        
+    Returns:
+        Response: application/json response
+    """
+    body = payload if isinstance(payload, bytes) else orjson.dumps(payload)
+    response = Response(mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    
+    # Weak, so the gzipped and plain representations share one tag
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    response.set_etag(etag, weak=True)
+    if request.if_none_match.contains_weak(etag):
+        response.status_code = 304
+        return response
+    
+    if len(body) >= GZIP_MIN_SIZE and 'gzip' in request.accept_encodings:
+        body = gzip.compress(body, compresslevel=6)
+        response.headers['Content-Encoding'] = 'gzip'
+    
+    response.set_data(body)
+    return response
+
+def int_arg(name, default, low, high):
+    """
+    Read an integer query parameter, clamped to a range.
+    
+    Args:
+        name (str): Query parameter name
+        default (int): Value used when the parameter is missing or not an integer
+        low (int): Smallest allowed value
+        high (int): Largest allowed value
+        
+    Returns:
+        int: The clamped value
+    """
+    try:
+        value = int(request.args.get(name, default))
+    except ValueError:
+        return default
+    return max(low, min(high, value))
 
 # Routes
 @app.route('/')
 def index():
     """Dashboard home page."""
     # Get latest system status
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with read_conn() as conn:
         cursor = conn.cursor()
         
         # Get latest system status
@@ -519,22 +1049,18 @@ def index():
         ''')
         totals = cursor.fetchone()
     
-    # Check for real token status
-    try:
-        real_token_valid, real_token_message, real_token_expiry, real_token_has_refresh = update_token_status()
-    except Exception as e:
-        logger.error(f"Error checking token status: {str(e)}")
+    # Token and system status are refreshed by background_monitor; use the latest rows
+    if token_status:
+        real_token_valid = bool(token_status['is_valid'])
+        real_token_message = token_status['message']
+        real_token_expiry = token_status['expiry']
+        real_token_has_refresh = bool(token_status['has_refresh_token'])
+    else:
         real_token_valid = False
-        real_token_message = f"Error checking token: {str(e)}"
+        real_token_message = "No token data"
         real_token_expiry = None
         real_token_has_refresh = False
     
-    # Also update system status
-    try:
-        status, cpu, memory, disk, next_run = update_system_status()
-    except Exception as e:
-        logger.error(f"Error updating system status: {str(e)}")
-    
     # Get YouTube API quota data
     quota_data = get_youtube_api_quota()
     
@@ -560,7 +1086,7 @@ def index():
             "expiry": real_token_expiry,
             "has_refresh": real_token_has_refresh
         },
-        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        timestamp=_now_str(),
         quota_data=quota_data,
         thresholds_data=thresholds_data,
         cleanup_data=cleanup_data,
@@ -570,24 +1096,23 @@ def index():
 @app.route('/api/stats')
 def api_stats():
     """API endpoint for dashboard stats."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with read_conn() as conn:
         cursor = conn.cursor()
         
         # Get processing stats for the past week
         cursor.execute('SELECT * FROM processing_stats ORDER BY timestamp DESC LIMIT 7')
-        processing_stats = [dict(row) for row in cursor.fetchall()]
+        processing_stats = cursor.fetchall()
         
         # Get latest system status
         cursor.execute('SELECT * FROM system_status ORDER BY id DESC LIMIT 1')
-        system_status = dict(cursor.fetchone() or {"status": "unknown"})
+        system_status = cursor.fetchone() or {"status": "unknown"}
         
         # Get latest token status
         cursor.execute('SELECT * FROM token_status ORDER BY id DESC LIMIT 1')
         token_row = cursor.fetchone()
-        token_status = dict(token_row) if token_row else {"is_valid": 0, "message": "No token data"}
+        token_status = token_row if token_row else {"is_valid": 0, "message": "No token data"}
     
-    return jsonify({
+    return json_response({
         "system_status": system_status,
         "token_status": token_status,
         "processing_stats": processing_stats
@@ -596,15 +1121,14 @@ def api_stats():
 @app.route('/api/uploads')
 def api_uploads():
     """API endpoint for recent uploads."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with read_conn() as conn:
         cursor = conn.cursor()
         
         # Get recent uploads
         cursor.execute('SELECT * FROM uploads ORDER BY timestamp DESC LIMIT 20')
-        uploads = [dict(row) for row in cursor.fetchall()]
+        uploads = cursor.fetchall()
     
-    return jsonify({"uploads": uploads})
+    return json_response({"uploads": uploads})
 
 @app.route('/authenticate')
 def authenticate():
@@ -621,6 +1145,27 @@ def authenticate():
         logger.error(f"Authentication error: {str(e)}")
         return jsonify({"success": False, "message": f"Error: {str(e)}"})
 
+def start_bridge(*args):
+    """
+    Start main.py in the background, detached from the dashboard process.
+    
+    Args:
+        *args: Extra command line arguments for main.py
+        
+    Returns:
+        subprocess.Popen: The started process
+    """
+    process = subprocess.Popen(
+        [sys.executable, 'main.py', *args],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True
+    )
+    bridge_process_status["pid"] = process.pid
+    return process
+
 @app.route('/controls', methods=['POST'])
 def controls():
     """Route for controlling the bridge process."""
@@ -633,7 +1178,7 @@ def controls():
         # Run the restart script if it exists
         try:
             # Execute restart command
-            os.system('nohup python3 main.py &')
+            start_bridge()
             return jsonify({'status': 'success', 'message': 'Bridge restarted successfully'})
         except Exception as e:
             logger.error(f"Error restarting bridge: {str(e)}")
@@ -657,6 +1202,8 @@ def controls():
         group = request.form.get('group')
         if not group:
             return jsonify({'status': 'error', 'message': 'No group specified'})
+        if not GROUP_NAME_RE.match(group):
+            return jsonify({'status': 'error', 'message': f'Invalid group name: {group}'})
         
         try:
             # Check for new format file first
@@ -671,10 +1218,9 @@ def controls():
                 return jsonify({'status': 'error', 'message': f'Group configuration file not found for {group}'})
             
             # Run the main script with the group parameter
-            command = f'nohup python3 main.py --group {group} &'
-            os.system(command)
+            process = start_bridge('--group', group)
             
-            logger.info(f"Started processing group {group} with command: {command}")
+            logger.info(f"Started processing group {group} (pid {process.pid})")
             
             return jsonify({
                 'status': 'success', 
@@ -728,50 +1274,35 @@ def config_settings():
 
 def record_upload(channel, video_id, video_title, youtube_id, status):
     """Record a video upload in the database."""
-    with sqlite3.connect(DB_PATH) as conn:
+    with write_conn() as conn:
         cursor = conn.cursor()
         cursor.execute('''
         INSERT INTO uploads (timestamp, channel, video_id, video_title, youtube_id, status)
         VALUES (?, ?, ?, ?, ?, ?)
-        ''', (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), channel, video_id, 
+        ''', (_now_str(), channel, video_id, 
               video_title, youtube_id, status))
-        conn.commit()
+    clear_response_caches()
     logger.info(f"Recorded upload: {video_title} - {status}")
 
 def update_processing_stats(videos_processed, videos_uploaded, videos_failed, channels_processed):
     """Update processing statistics in the database."""
-    with sqlite3.connect(DB_PATH) as conn:
+    now = time.localtime()
+    
+    with write_conn() as conn:
         cursor = conn.cursor()
         
-        # Check if we already have a record for today
-        today = datetime.now().strftime('%Y-%m-%d')
+        # Add to today's record, creating it on the first run of the day
         cursor.execute('''
-        SELECT id, videos_processed, videos_uploaded, videos_failed, channels_processed 
-        FROM processing_stats 
-        WHERE timestamp LIKE ?
-        ''', (f"{today}%",))
-        
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing record
-            cursor.execute('''
-            UPDATE processing_stats 
-            SET videos_processed = videos_processed + ?,
-                videos_uploaded = videos_uploaded + ?,
-                videos_failed = videos_failed + ?,
-                channels_processed = channels_processed + ?
-            WHERE id = ?
-            ''', (videos_processed, videos_uploaded, videos_failed, channels_processed, existing[0]))
-        else:
-            # Insert new record
-            cursor.execute('''
-            INSERT INTO processing_stats (timestamp, videos_processed, videos_uploaded, videos_failed, channels_processed)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 
-                  videos_processed, videos_uploaded, videos_failed, channels_processed))
-        
-        conn.commit()
+        INSERT INTO processing_stats (timestamp, date_day, videos_processed, videos_uploaded, videos_failed, channels_processed)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(date_day) DO UPDATE SET
+            videos_processed = videos_processed + excluded.videos_processed,
+            videos_uploaded = videos_uploaded + excluded.videos_uploaded,
+            videos_failed = videos_failed + excluded.videos_failed,
+            channels_processed = channels_processed + excluded.channels_processed
+        ''', (_now_str(now), time.strftime('%Y-%m-%d', now),
+              videos_processed, videos_uploaded, videos_failed, channels_processed))
+    clear_response_caches()
     logger.info(f"Updated processing stats: {videos_processed} processed, {videos_uploaded} uploaded, {videos_failed} failed")
 
 def run_dashboard(host='0.0.0.0', port=8080, debug=False):
@@ -790,7 +1321,8 @@ def run_dashboard(host='0.0.0.0', port=8080, debug=False):
     monitor_thread.start()
     
     # Run Flask app
-    run_simple(host, port, app, use_reloader=debug, use_debugger=debug)
+    # Threaded so slow requests don't queue the others behind them
+    run_simple(host, port, app, use_reloader=debug, use_debugger=debug, threaded=True)
 
 def start_dashboard_thread():
     """Start the dashboard in a separate thread."""
@@ -800,11 +1332,60 @@ def start_dashboard_thread():
     logger.info("Dashboard started in background thread")
     return dashboard_thread
 
+def _reversed_lines(path, block_size=65536):
+    """
+    Yield the lines of a file from last to first by seeking backwards from the end.
+    
+    Args:
+        path (str): Path of the file to read
+        block_size (int): Bytes read per backwards step
+        
+    Yields:
+        str: Lines decoded with line endings normalized as in text mode
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        partial = b''
+        while pos > 0:
+            read_size = min(block_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            parts = (f.read(read_size) + partial).splitlines(keepends=True)
+            # The first line may continue in the previous block, so keep it for the next step
+            partial = parts.pop(0) if pos > 0 and parts else b''
+            
+            for line in reversed(parts):
+                text = line.decode('utf-8', errors='replace')
+                if text.endswith('\r\n'):
+                    text = text[:-2] + '\n'
+                elif text.endswith('\r'):
+                    text = text[:-1] + '\n'
+                yield text
+
+def _tail_lines(path, count, match=None, block_size=65536):
+    """
+    Read the last lines of a file by seeking backwards from the end.
+    
+    Args:
+        path (str): Path of the file to read
+        count (int): Number of lines to return
+        match (callable): Optional predicate; only lines it accepts are counted and returned
+        block_size (int): Bytes read per backwards step
+        
+    Returns:
+        list: The last count (matching) lines in file order, decoded with line
+            endings normalized as in text mode
+    """
+    lines = list(itertools.islice(filter(match, _reversed_lines(path, block_size)), count))
+    lines.reverse()
+    return lines
+
 @app.route('/api/logs')
 def api_logs():
     """API endpoint for application logs."""
     level = request.args.get('level', 'ALL')
-    lines = int(request.args.get('lines', '100'))
+    lines = int_arg('lines', 100, 0, MAX_LOG_LINES)
     
     log_file = config.LOGGING['log_file']
     
@@ -812,18 +1393,13 @@ def api_logs():
         return jsonify({"logs": []})
     
     try:
-        # Read the log file
-        with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
-            log_lines = f.readlines()
+        # Filter by level if specified, as a whole word so INFO does not match INFORMATION
+        match = None if level == 'ALL' else re.compile(rf'\b{re.escape(level)}\b').search
         
-        # Limit to the requested number of lines (from the end)
-        log_lines = log_lines[-lines:]
+        # Read backwards only until the requested number of matching lines is found
+        log_lines = _tail_lines(log_file, lines, match) if lines > 0 else []
         
-        # Filter by level if specified
-        if level != 'ALL':
-            log_lines = [line for line in log_lines if level in line]
-        
-        return jsonify({"logs": log_lines})
+        return json_response({"logs": log_lines})
     except Exception as e:
         logger.error(f"Error reading log file: {str(e)}")
         return jsonify({"logs": [], "error": str(e)})
@@ -833,33 +1409,34 @@ def api_video(youtube_id):
     """API endpoint for embedding a YouTube video."""
     if not youtube_id:
         return jsonify({"error": "No YouTube ID provided"})
+    if not YOUTUBE_ID_RE.match(youtube_id):
+        return jsonify({"error": f"Invalid YouTube ID: {youtube_id}"})
     
-    embed_html = f'''
-    <iframe 
-        width="100%" 
-        height="315" 
-        src="https://www.youtube.com/embed/{youtube_id}" 
-        frameborder="0" 
-        allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" 
-        allowfullscreen>
-    </iframe>
-    '''
-    
-    return jsonify({"embed_html": embed_html})
+    return jsonify({"embed_html": EMBED_HTML_TEMPLATE.format(youtube_id=youtube_id)})
 
 @app.route('/api/analytics')
 def api_analytics():
     """API endpoint for analytics data."""
-    days = int(request.args.get('days', '30'))
+    days = int_arg('days', 30, 1, MAX_QUERY_DAYS)
+    return json_response(compute_analytics(days))
+
+@ttl_cache(30)
+@json_encoded
+def compute_analytics(days):
+    """
+    Aggregate daily activity and per-channel upload stats.
     
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    Args:
+        days (int): Number of days to include
+        
+    Returns:
+        dict: Analytics payload for /api/analytics
+    """
+    with read_conn() as conn:
         cursor = conn.cursor()
         
-        # Set the date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        start_date_str = start_date.strftime('%Y-%m-%d')
+        # Set the date range; SQLite resolves it against its own clock
+        since = f'-{days} days'
         
         # Get daily stats for the activity chart
         cursor.execute('''
@@ -869,12 +1446,12 @@ def api_analytics():
             SUM(videos_uploaded) as uploaded,
             SUM(videos_failed) as failed
         FROM processing_stats
-        WHERE timestamp >= ?
+        WHERE timestamp >= date('now', 'localtime', ?)
         GROUP BY date
         ORDER BY date
-        ''', (start_date_str,))
+        ''', (since,))
         
-        daily_stats = [dict(row) for row in cursor.fetchall()]
+        daily_stats = cursor.fetchall()
         
         # Get channel stats
         cursor.execute('''
@@ -884,16 +1461,19 @@ def api_analytics():
             SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END) as successful,
             MAX(timestamp) as last_upload
         FROM uploads
-        WHERE timestamp >= ?
+        WHERE timestamp >= date('now', 'localtime', ?)
         GROUP BY channel
         ORDER BY total DESC
-        ''', (start_date_str,))
+        ''', (since,))
         
-        channel_stats = [dict(row) for row in cursor.fetchall()]
+        channel_stats = cursor.fetchall()
         
-        # Calculate success rate
-        total_uploads = sum(stat['total'] for stat in channel_stats) if channel_stats else 0
-        successful_uploads = sum(stat['successful'] for stat in channel_stats) if channel_stats else 0
+        # Calculate success rate from the per-channel totals in a single pass
+        total_uploads = 0
+        successful_uploads = 0
+        for stat in channel_stats:
+            total_uploads += stat['total']
+            successful_uploads += stat['successful']
         success_rate = round((successful_uploads / total_uploads) * 100 if total_uploads > 0 else 0, 1)
         
         # Calculate average uploads per day
@@ -903,7 +1483,7 @@ def api_analytics():
         # Get top channel
         top_channel = channel_stats[0]['channel'] if channel_stats else "None"
     
-    return jsonify({
+    return {
         "daily_stats": daily_stats,
         "channel_stats": channel_stats,
         "summary": {
@@ -914,22 +1494,33 @@ def api_analytics():
             "top_channel": top_channel,
             "period_days": days
         }
-    })
+    }
 
 @app.route('/api/metrics')
 def api_metrics():
     """API endpoint for video metrics comparison."""
-    days = int(request.args.get('days', '30'))
-    limit = int(request.args.get('limit', '10'))
+    days = int_arg('days', 30, 1, MAX_QUERY_DAYS)
+    limit = int_arg('limit', 10, 1, MAX_QUERY_LIMIT)
+    return json_response(compute_metrics(days, limit))
+
+@ttl_cache(30)
+@json_encoded
+def compute_metrics(days, limit):
+    """
+    Compare YouTube and TikTok metrics per video and per channel.
     
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    Args:
+        days (int): Number of days to include
+        limit (int): Maximum number of videos to return
+        
+    Returns:
+        dict: Metrics payload for /api/metrics
+    """
+    with read_conn() as conn:
         cursor = conn.cursor()
         
-        # Set the date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        start_date_str = start_date.strftime('%Y-%m-%d')
+        # Set the date range; SQLite resolves it against its own clock
+        since = f'-{days} days'
         
         # Get videos with both TikTok and YouTube metrics
         cursor.execute('''
@@ -947,45 +1538,57 @@ def api_metrics():
             u.timestamp as upload_date
         FROM uploads u
         JOIN youtube_metrics ym ON u.youtube_id = ym.youtube_id
-        WHERE u.timestamp >= ? AND u.status = 'success'
+        WHERE u.timestamp >= date('now', 'localtime', ?) AND u.status = 'success'
         ORDER BY u.timestamp DESC
         LIMIT ?
-        ''', (start_date_str, limit))
+        ''', (since, limit))
+        
+        metrics = cursor.fetchall()
         
-        metrics = [dict(row) for row in cursor.fetchall()]
+        # Aggregate totals in the same pass that computes per-video stats
+        total_yt_views = total_tk_views = 0
+        total_yt_likes = total_tk_likes = 0
+        total_yt_comments = total_tk_comments = 0
+        total_yt_engagement = total_tk_engagement = 0
         
         # Calculate engagement stats
         for video in metrics:
-            # Calculate YouTube engagement rate
             yt_views = video['youtube_views']
-            yt_engagement = (video['youtube_likes'] + video['youtube_comments']) / max(yt_views, 1) * 100
-            video['youtube_engagement'] = round(yt_engagement, 2)
+            yt_likes = video['youtube_likes']
+            yt_comments = video['youtube_comments']
+            tk_views = video['tiktok_views']
+            tk_likes = video['tiktok_likes']
+            tk_comments = video['tiktok_comments']
+            
+            # Calculate YouTube engagement rate
+            yt_engagement = round((yt_likes + yt_comments) / max(yt_views, 1) * 100, 2)
+            video['youtube_engagement'] = yt_engagement
             
             # Calculate TikTok engagement rate
-            tk_views = video['tiktok_views']
-            tk_engagement = (video['tiktok_likes'] + video['tiktok_comments'] + video['tiktok_shares']) / max(tk_views, 1) * 100
-            video['tiktok_engagement'] = round(tk_engagement, 2)
+            tk_engagement = round((tk_likes + tk_comments + video['tiktok_shares']) / max(tk_views, 1) * 100, 2)
+            video['tiktok_engagement'] = tk_engagement
             
             # Calculate ratios (YouTube compared to TikTok)
             video['views_ratio'] = round(yt_views / max(tk_views, 1) * 100, 2) if tk_views > 0 else 0
-            video['likes_ratio'] = round(video['youtube_likes'] / max(video['tiktok_likes'], 1) * 100, 2) if video['tiktok_likes'] > 0 else 0
-            video['comments_ratio'] = round(video['youtube_comments'] / max(video['tiktok_comments'], 1) * 100, 2) if video['tiktok_comments'] > 0 else 0
-        
-        # Calculate aggregate stats
-        total_yt_views = sum(video['youtube_views'] for video in metrics)
-        total_tk_views = sum(video['tiktok_views'] for video in metrics)
-        total_yt_likes = sum(video['youtube_likes'] for video in metrics)
-        total_tk_likes = sum(video['tiktok_likes'] for video in metrics)
-        total_yt_comments = sum(video['youtube_comments'] for video in metrics)
-        total_tk_comments = sum(video['tiktok_comments'] for video in metrics)
+            video['likes_ratio'] = round(yt_likes / max(tk_likes, 1) * 100, 2) if tk_likes > 0 else 0
+            video['comments_ratio'] = round(yt_comments / max(tk_comments, 1) * 100, 2) if tk_comments > 0 else 0
+            
+            total_yt_views += yt_views
+            total_tk_views += tk_views
+            total_yt_likes += yt_likes
+            total_tk_likes += tk_likes
+            total_yt_comments += yt_comments
+            total_tk_comments += tk_comments
+            total_yt_engagement += yt_engagement
+            total_tk_engagement += tk_engagement
         
         avg_views_ratio = round(total_yt_views / max(total_tk_views, 1) * 100, 2) if total_tk_views > 0 else 0
         avg_likes_ratio = round(total_yt_likes / max(total_tk_likes, 1) * 100, 2) if total_tk_likes > 0 else 0
         avg_comments_ratio = round(total_yt_comments / max(total_tk_comments, 1) * 100, 2) if total_tk_comments > 0 else 0
         
         # Average engagement rates
-        avg_yt_engagement = sum(video['youtube_engagement'] for video in metrics) / max(len(metrics), 1)
-        avg_tk_engagement = sum(video['tiktok_engagement'] for video in metrics) / max(len(metrics), 1)
+        avg_yt_engagement = total_yt_engagement / max(len(metrics), 1)
+        avg_tk_engagement = total_tk_engagement / max(len(metrics), 1)
         
         # Get metrics by channel
         cursor.execute('''
@@ -997,30 +1600,22 @@ def api_metrics():
             SUM(ym.tiktok_views) as tiktok_views,
             SUM(ym.tiktok_likes) as tiktok_likes,
             SUM(ym.tiktok_comments) as tiktok_comments,
-            COUNT(u.id) as video_count
+            COUNT(u.id) as video_count,
+            ROUND((SUM(ym.likes) + SUM(ym.comments)) * 1.0 / MAX(SUM(ym.views), 1) * 100, 2) as youtube_engagement,
+            ROUND((SUM(ym.tiktok_likes) + SUM(ym.tiktok_comments)) * 1.0 / MAX(SUM(ym.tiktok_views), 1) * 100, 2) as tiktok_engagement,
+            CASE WHEN SUM(ym.tiktok_views) > 0
+                 THEN ROUND(SUM(ym.views) * 1.0 / SUM(ym.tiktok_views) * 100, 2)
+                 ELSE 0 END as views_ratio
         FROM uploads u
         JOIN youtube_metrics ym ON u.youtube_id = ym.youtube_id
-        WHERE u.timestamp >= ? AND u.status = 'success'
+        WHERE u.timestamp >= date('now', 'localtime', ?) AND u.status = 'success'
         GROUP BY u.channel
         ORDER BY video_count DESC
-        ''', (start_date_str,))
+        ''', (since,))
         
-        channel_metrics = [dict(row) for row in cursor.fetchall()]
-        
-        # Calculate channel engagement rates
-        for channel in channel_metrics:
-            yt_views = channel['youtube_views']
-            yt_engagement = (channel['youtube_likes'] + channel['youtube_comments']) / max(yt_views, 1) * 100
-            channel['youtube_engagement'] = round(yt_engagement, 2)
-            
-            tk_views = channel['tiktok_views']
-            tk_engagement = (channel['tiktok_likes'] + channel['tiktok_comments']) / max(tk_views, 1) * 100
-            channel['tiktok_engagement'] = round(tk_engagement, 2)
-            
-            # Calculate view ratio
-            channel['views_ratio'] = round(yt_views / max(tk_views, 1) * 100, 2) if tk_views > 0 else 0
+        channel_metrics = cursor.fetchall()
     
-    return jsonify({
+    return {
         "videos": metrics,
         "channels": channel_metrics,
         "summary": {
@@ -1037,86 +1632,87 @@ def api_metrics():
             "avg_youtube_engagement": round(avg_yt_engagement, 2),
             "avg_tiktok_engagement": round(avg_tk_engagement, 2)
         }
-    })
+    }
 
 @app.route('/api/metrics/growth/<youtube_id>')
 def api_metrics_growth(youtube_id):
     """API endpoint for tracking metrics growth over time for a specific video."""
-    days = int(request.args.get('days', '30'))
+    days = int_arg('days', 30, 1, MAX_QUERY_DAYS)
+    return json_response(compute_metrics_growth(youtube_id, days))
+
+@ttl_cache(30)
+@json_encoded
+def compute_metrics_growth(youtube_id, days):
+    """
+    Build the per-day metrics history of one video on both platforms.
     
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    Args:
+        youtube_id (str): YouTube video ID
+        days (int): Number of days to include
+        
+    Returns:
+        dict: Growth payload for /api/metrics/growth
+    """
+    with read_conn() as conn:
         cursor = conn.cursor()
         
-        # Set the date range
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        start_date_str = start_date.strftime('%Y-%m-%d')
+        # Set the date range; SQLite resolves it against its own clock
+        since = f'-{days} days'
         
-        # Get metrics history for this video
+        # Get metrics history for this video, one row per date with both platforms side by side
         cursor.execute('''
         SELECT 
             strftime('%Y-%m-%d', timestamp) as date,
-            platform,
-            AVG(views) as views,
-            AVG(likes) as likes,
-            AVG(comments) as comments,
-            AVG(shares) as shares
+            AVG(CASE WHEN platform = 'youtube' THEN views END) as yt_views,
+            AVG(CASE WHEN platform = 'youtube' THEN likes END) as yt_likes,
+            AVG(CASE WHEN platform = 'youtube' THEN comments END) as yt_comments,
+            AVG(CASE WHEN platform = 'tiktok' THEN views END) as tk_views,
+            AVG(CASE WHEN platform = 'tiktok' THEN likes END) as tk_likes,
+            AVG(CASE WHEN platform = 'tiktok' THEN comments END) as tk_comments,
+            AVG(CASE WHEN platform = 'tiktok' THEN shares END) as tk_shares
         FROM metrics_history
-        WHERE youtube_id = ? AND timestamp >= ?
-        GROUP BY date, platform
+        WHERE youtube_id = ? AND timestamp >= date('now', 'localtime', ?)
+        GROUP BY date
         ORDER BY date
-        ''', (youtube_id, start_date_str))
+        ''', (youtube_id, since))
         
         rows = cursor.fetchall()
         
-        # Format data by platform and date
-        dates = []
-        youtube_data = {'views': [], 'likes': [], 'comments': []}
-        tiktok_data = {'views': [], 'likes': [], 'comments': [], 'shares': []}
-        
-        current_date = None
-        
-        for row in rows:
-            date = row['date']
-            
-            # Add date to the dates list if it's new
-            if date != current_date:
-                dates.append(date)
-                current_date = date
-            
-            # Add metrics to the appropriate platform
-            if row['platform'] == 'youtube':
-                youtube_data['views'].append(row['views'])
-                youtube_data['likes'].append(row['likes'])
-                youtube_data['comments'].append(row['comments'])
-            else:  # tiktok
-                tiktok_data['views'].append(row['views'])
-                tiktok_data['likes'].append(row['likes'])
-                tiktok_data['comments'].append(row['comments'])
-                tiktok_data['shares'].append(row['shares'])
+        # Split the date-aligned rows into per-platform series
+        dates = [row['date'] for row in rows]
+        youtube_data = {
+            'views': [row['yt_views'] for row in rows],
+            'likes': [row['yt_likes'] for row in rows],
+            'comments': [row['yt_comments'] for row in rows]
+        }
+        tiktok_data = {
+            'views': [row['tk_views'] for row in rows],
+            'likes': [row['tk_likes'] for row in rows],
+            'comments': [row['tk_comments'] for row in rows],
+            'shares': [row['tk_shares'] for row in rows]
+        }
         
         # Get video title
         cursor.execute('SELECT video_title FROM uploads WHERE youtube_id = ?', (youtube_id,))
         title_row = cursor.fetchone()
         video_title = title_row['video_title'] if title_row else 'Unknown Video'
     
-    return jsonify({
+    return {
         'video_id': youtube_id,
         'video_title': video_title,
         'dates': dates,
         'youtube': youtube_data,
         'tiktok': tiktok_data
-    })
+    }
 
 # New function to track deleted YouTube videos
 def track_deleted_youtube_video(youtube_id):
-    with sqlite3.connect(DB_PATH) as conn:
+    with write_conn() as conn:
         cursor = conn.cursor()
         cursor.execute('''
         UPDATE uploads SET status = 'deleted' WHERE youtube_id = ?
         ''', (youtube_id,))
-        conn.commit()
+    clear_response_caches()
     logger.info(f"Video with YouTube ID {youtube_id} marked as deleted in dashboard.")
 
 @app.route('/api/video/<youtube_id>/delete', methods=['POST'])
@@ -1126,42 +1722,55 @@ def delete_video(youtube_id):
 
 @app.route('/api/deleted-videos')
 def get_deleted_videos():
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with read_conn() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT * FROM uploads WHERE status = "deleted" ORDER BY timestamp DESC')
-        deleted_videos = [dict(row) for row in cursor.fetchall()]
+        deleted_videos = cursor.fetchall()
     return jsonify({"deleted_videos": deleted_videos})
 
 @app.route('/api/cleanup', methods=['POST'])
 def cleanup_old_data():
-    days = int(request.json.get('days', 30))
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM processing_stats WHERE timestamp < datetime("now", ?)', (f'-{days} days',))
-        cursor.execute('DELETE FROM metrics_history WHERE timestamp < datetime("now", ?)', (f'-{days} days',))
-        conn.commit()
+    days = max(1, int(request.json.get('days', 30)))
+    cutoff = f'-{days} days'
+    for delete_sql in CLEANUP_DELETE_SQL:
+        # Delete in short transactions so other writers are not locked out for the whole cleanup
+        while True:
+            with write_conn() as conn:
+                deleted = conn.execute(delete_sql, (cutoff, CLEANUP_BATCH_SIZE)).rowcount
+            if deleted < CLEANUP_BATCH_SIZE:
+                break
+    clear_response_caches()
     return jsonify({"status": "success", "message": f"Cleaned up data older than {days} days."})
 
 @app.route('/api/dashboard-summary')
 def dashboard_summary():
     """API endpoint for a comprehensive dashboard summary."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    return json_response(compute_dashboard_summary())
+
+@ttl_cache(5)
+@json_encoded
+def compute_dashboard_summary():
+    """
+    Collect the latest status, totals and upload lists for the dashboard.
+    
+    Returns:
+        dict: Summary payload for /api/dashboard-summary
+    """
+    with read_conn() as conn:
         cursor = conn.cursor()
         
         # Get latest system status
         cursor.execute('SELECT * FROM system_status ORDER BY id DESC LIMIT 1')
-        system_status = dict(cursor.fetchone() or {"status": "unknown"})
+        system_status = cursor.fetchone() or {"status": "unknown"}
         
         # Get latest token status
         cursor.execute('SELECT * FROM token_status ORDER BY id DESC LIMIT 1')
         token_row = cursor.fetchone()
-        token_status = dict(token_row) if token_row else {"is_valid": 0, "message": "No token data"}
+        token_status = token_row if token_row else {"is_valid": 0, "message": "No token data"}
         
         # Get recent processing stats
         cursor.execute('SELECT * FROM processing_stats ORDER BY timestamp DESC LIMIT 7')
-        processing_stats = [dict(row) for row in cursor.fetchall()]
+        processing_stats = cursor.fetchall()
         
         # Get total stats
         cursor.execute('''
@@ -1170,15 +1779,15 @@ def dashboard_summary():
                SUM(videos_failed) as total_failed
         FROM processing_stats
         ''')
-        totals = dict(cursor.fetchone() or {})
+        totals = cursor.fetchone() or {}
         
         # Get recent uploads
         cursor.execute('SELECT * FROM uploads ORDER BY timestamp DESC LIMIT 10')
-        recent_uploads = [dict(row) for row in cursor.fetchall()]
+        recent_uploads = cursor.fetchall()
         
         # Get deleted videos
         cursor.execute('SELECT * FROM uploads WHERE status = "deleted" ORDER BY timestamp DESC LIMIT 10')
-        deleted_videos = [dict(row) for row in cursor.fetchall()]
+        deleted_videos = cursor.fetchall()
         
         # Get channel stats
         cursor.execute('''
@@ -1187,9 +1796,9 @@ def dashboard_summary():
         GROUP BY channel
         ORDER BY total DESC
         ''')
-        channel_stats = [dict(row) for row in cursor.fetchall()]
+        channel_stats = cursor.fetchall()
     
-    return jsonify({
+    return {
         "system_status": system_status,
         "token_status": token_status,
         "processing_stats": processing_stats,
@@ -1197,10 +1806,11 @@ def dashboard_summary():
         "recent_uploads": recent_uploads,
         "deleted_videos": deleted_videos,
         "channel_stats": channel_stats,
-        "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    })
+        "timestamp": _now_str()
+    }
 
 # Add new function to get YouTube API quota data
+@ttl_cache(30)
 def get_youtube_api_quota():
     """Get YouTube API quota data from the log file."""
     quota_file = os.path.join(os.path.dirname(__file__), 'youtube_api_quota.json')
@@ -1210,33 +1820,29 @@ def get_youtube_api_quota():
                 quota_data = json.load(f)
                 
             # Save quota data to database for historical tracking
-            with sqlite3.connect(DB_PATH) as conn:
+            with write_conn() as conn:
                 cursor = conn.cursor()
                 today = datetime.now().strftime('%Y-%m-%d')
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                timestamp = _now_str()
                 
                 if today in quota_data:
-                    # Save overall usage
+                    # Overall usage followed by operation-specific usage
                     used = quota_data[today].get('used', 0)
                     remaining = quota_data[today].get('remaining', 10000)
+                    operations = quota_data[today].get('operations', {})
+                    
+                    rows = [(timestamp, today, used, remaining, 'total', 0, 0)]
+                    rows.extend(
+                        (timestamp, today, used, remaining, op_name,
+                         op_data.get('count', 0), op_data.get('cost', 0))
+                        for op_name, op_data in operations.items()
+                    )
                     
-                    cursor.execute('''
+                    cursor.executemany('''
                     INSERT INTO youtube_api_quota (
                         timestamp, date, used, remaining, operation, operation_count, operation_cost
                     ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (timestamp, today, used, remaining, 'total', 0, 0))
-                    
-                    # Save operation-specific usage
-                    operations = quota_data[today].get('operations', {})
-                    for op_name, op_data in operations.items():
-                        cursor.execute('''
-                        INSERT INTO youtube_api_quota (
-                            timestamp, date, used, remaining, operation, operation_count, operation_cost
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                        ''', (timestamp, today, used, remaining, op_name, 
-                              op_data.get('count', 0), op_data.get('cost', 0)))
-                
-                conn.commit()
+                    ''', rows)
                 
             return quota_data
                 
@@ -1246,11 +1852,11 @@ def get_youtube_api_quota():
     return {}
 
 # Add new function to get dynamic threshold data
+@ttl_cache(30)
 def get_dynamic_thresholds():
     """Get dynamic view thresholds for channels."""
     try:
-        video_history = VideoHistory()
-        content_analyzer = ContentAnalyzer()
+        video_history = get_video_history()
         
         # Get all channels from configuration files
         channels_data = {}
@@ -1269,24 +1875,23 @@ def get_dynamic_thresholds():
             group_file = os.path.join(os.path.dirname(__file__), f'channels-{group}.json')
             if os.path.exists(group_file):
                 try:
-                    with open(group_file, 'r') as f:
-                        group_config = json.load(f)
-                        if 'channels' in group_config:
-                            for channel in group_config['channels']:
-                                # For new format files, channels may be objects with username field
-                                if isinstance(channel, dict) and 'username' in channel:
-                                    username = channel['username']
-                                else:
-                                    username = channel
-                                    
-                                # Remove @ if present
-                                clean_channel = username[1:] if username.startswith('@') else username
-                                # Get publish days if available
-                                publish_days = group_config.get('settings', {}).get('publish_days', [])
-                                channels_data[clean_channel] = {
-                                    'group': group,
-                                    'publish_days': publish_days
-                                }
+                    group_config = load_json_file(group_file)
+                    if 'channels' in group_config:
+                        for channel in group_config['channels']:
+                            # For new format files, channels may be objects with username field
+                            if isinstance(channel, dict) and 'username' in channel:
+                                username = channel['username']
+                            else:
+                                username = channel
+                                
+                            # Remove @ if present
+                            clean_channel = username[1:] if username.startswith('@') else username
+                            # Get publish days if available
+                            publish_days = group_config.get('settings', {}).get('publish_days', [])
+                            channels_data[clean_channel] = {
+                                'group': group,
+                                'publish_days': publish_days
+                            }
                 except Exception as e:
                     logger.error(f"Error reading channel group {group}: {str(e)}")
         
@@ -1296,40 +1901,46 @@ def get_dynamic_thresholds():
             group_file = os.path.join(os.path.dirname(__file__), f'channels{group}.json')
             if os.path.exists(group_file):
                 try:
-                    with open(group_file, 'r') as f:
-                        group_config = json.load(f)
-                        if 'channels' in group_config:
-                            for channel in group_config['channels']:
-                                # Remove @ if present
-                                clean_channel = channel[1:] if channel.startswith('@') else channel
-                                # Get publish days if available
-                                publish_days = group_config.get('settings', {}).get('publish_days', [])
-                                channels_data[clean_channel] = {
-                                    'group': group,
-                                    'publish_days': publish_days
-                                }
+                    group_config = load_json_file(group_file)
+                    if 'channels' in group_config:
+                        for channel in group_config['channels']:
+                            # Remove @ if present
+                            clean_channel = channel[1:] if channel.startswith('@') else channel
+                            # Get publish days if available
+                            publish_days = group_config.get('settings', {}).get('publish_days', [])
+                            channels_data[clean_channel] = {
+                                'group': group,
+                                'publish_days': publish_days
+                            }
                 except Exception as e:
                     logger.error(f"Error reading legacy channel group {group}: {str(e)}")
         
         # Get channel history for view analysis
         thresholds_data = []
+        threshold_rows = []
+        timestamp = _now_str()
         
         for channel, data in channels_data.items():
             history = video_history.get_channel_history(channel)
             if history:
                 # Extract view counts
-                view_counts = [int(video.get('metrics', {}).get('views', 0)) for video in history]
-                view_counts = [views for views in view_counts if views > 0]
+                view_counts = np.fromiter(
+                    (int(video.get('metrics', {}).get('views', 0)) for video in history),
+                    dtype=np.int64,
+                    count=len(history)
+                )
+                view_counts = view_counts[view_counts > 0]
                 
-                if view_counts:
-                    # Sort for percentiles
-                    view_counts.sort()
+                if view_counts.size:
+                    # Select the median and 75th percentile positions in O(N) instead of a full sort
+                    median_index = view_counts.size // 2
+                    percentile_75_index = int(view_counts.size * 0.75)
+                    partitioned = np.partition(view_counts, (median_index, percentile_75_index))
                     
                     # Calculate statistics
-                    avg_views = sum(view_counts) / len(view_counts)
-                    median_views = view_counts[len(view_counts) // 2]
-                    percentile_75_index = int(len(view_counts) * 0.75)
-                    percentile_75 = view_counts[percentile_75_index] if percentile_75_index < len(view_counts) else median_views
+                    avg_views = float(view_counts.mean())
+                    median_views = int(partitioned[median_index])
+                    percentile_75 = int(partitioned[percentile_75_index])
                     
                     # Determine channel size
                     if avg_views < 20000:
@@ -1348,19 +1959,9 @@ def get_dynamic_thresholds():
                     max_bound = 500000
                     threshold = max(min_bound, min(threshold, max_bound))
                     
-                    # Add to database
-                    with sqlite3.connect(DB_PATH) as conn:
-                        cursor = conn.cursor()
-                        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        
-                        cursor.execute('''
-                        INSERT INTO dynamic_thresholds (
-                            timestamp, channel, channel_size, avg_views, median_views, percentile_75, threshold
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                        ''', (timestamp, channel, channel_size, int(avg_views), int(median_views), 
-                              int(percentile_75), int(threshold)))
-                        
-                        conn.commit()
+                    # Queue for the database
+                    threshold_rows.append((timestamp, channel, channel_size, int(avg_views), int(median_views),
+                                           int(percentile_75), int(threshold)))
                     
                     # Add to return data
                     thresholds_data.append({
@@ -1374,6 +1975,14 @@ def get_dynamic_thresholds():
                         'threshold': int(threshold)
                     })
         
+        # Record every channel's threshold in a single transaction
+        if threshold_rows:
+            queue_history_write('''
+            INSERT INTO dynamic_thresholds (
+                timestamp, channel, channel_size, avg_views, median_views, percentile_75, threshold
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', threshold_rows)
+        
         return thresholds_data
                 
     except Exception as e:
@@ -1381,10 +1990,11 @@ def get_dynamic_thresholds():
         return []
 
 # Add new function to get file cleanup statistics
+@ttl_cache(30)
 def get_cleanup_stats():
     """Get statistics about file cleanup operations."""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with read_conn() as conn:
             cursor = conn.cursor()
             
             # Get the most recent cleanup operations
@@ -1394,13 +2004,9 @@ def get_cleanup_stats():
             LIMIT 10
             ''')
             
-            cleanup_ops = cursor.fetchall()
+            cleanup_data = cursor.fetchall()
             
-            if cleanup_ops:
-                # Convert to dictionaries
-                columns = [col[0] for col in cursor.description]
-                cleanup_data = [dict(zip(columns, row)) for row in cleanup_ops]
-                
+            if cleanup_data:
                 # Calculate totals
                 total_files = sum(op['files_removed'] for op in cleanup_data)
                 total_space = sum(op['space_freed_mb'] for op in cleanup_data)
@@ -1426,6 +2032,7 @@ def get_cleanup_stats():
         }
 
 # Add new function to get channel groups
+@ttl_cache(30)
 def get_channel_groups():
     """Get information about channel groups and their settings."""
     try:
@@ -1437,8 +2044,31 @@ def get_channel_groups():
             group_file = os.path.join(os.path.dirname(__file__), f'channels-{group}.json')
             if os.path.exists(group_file):
                 try:
-                    with open(group_file, 'r') as f:
-                        group_config = json.load(f)
+                    group_config = load_json_file(group_file)
+                    if 'channels' in group_config and 'settings' in group_config:
+                        channels = group_config['channels']
+                        settings = group_config['settings']
+                        
+                        # Store group data
+                        groups_data[group] = {
+                            'channels': channels,
+                            'publish_days': settings.get('publish_days', []),
+                            'run_interval': settings.get('run_interval', 259200),
+                            'last_run': None,  # Will be populated from logs if available
+                            'next_run': None,  # Will be calculated below
+                            'channel_count': len(channels)
+                        }
+                except Exception as e:
+                    logger.error(f"Error reading channel group {group}: {str(e)}")
+        
+        # If no new format files found, check legacy format files
+        if not groups_data:
+            legacy_groups = ['A', 'B', 'C']
+            for group in legacy_groups:
+                group_file = os.path.join(os.path.dirname(__file__), f'channels{group}.json')
+                if os.path.exists(group_file):
+                    try:
+                        group_config = load_json_file(group_file)
                         if 'channels' in group_config and 'settings' in group_config:
                             channels = group_config['channels']
                             settings = group_config['settings']
@@ -1452,87 +2082,56 @@ def get_channel_groups():
                                 'next_run': None,  # Will be calculated below
                                 'channel_count': len(channels)
                             }
-                except Exception as e:
-                    logger.error(f"Error reading channel group {group}: {str(e)}")
-        
-        # If no new format files found, check legacy format files
-        if not groups_data:
-            legacy_groups = ['A', 'B', 'C']
-            for group in legacy_groups:
-                group_file = os.path.join(os.path.dirname(__file__), f'channels{group}.json')
-                if os.path.exists(group_file):
-                    try:
-                        with open(group_file, 'r') as f:
-                            group_config = json.load(f)
-                            if 'channels' in group_config and 'settings' in group_config:
-                                channels = group_config['channels']
-                                settings = group_config['settings']
-                                
-                                # Store group data
-                                groups_data[group] = {
-                                    'channels': channels,
-                                    'publish_days': settings.get('publish_days', []),
-                                    'run_interval': settings.get('run_interval', 259200),
-                                    'last_run': None,  # Will be populated from logs if available
-                                    'next_run': None,  # Will be calculated below
-                                    'channel_count': len(channels)
-                                }
                     except Exception as e:
                         logger.error(f"Error reading legacy channel group {group}: {str(e)}")
         
         # Try to determine last run times from the log file
         log_file = os.path.join(os.path.dirname(__file__), config.LOGGING['log_file'])
-        if os.path.exists(log_file):
+        if groups_data and os.path.exists(log_file):
             try:
-                with open(log_file, 'r') as f:
-                    log_content = f.readlines()
+                # Scan backwards from the end once, until every group's last run is found
+                remaining = set(groups_data)
+                for line in _reversed_lines(log_file):
+                    run = GROUP_RUN_RE.search(line)
+                    group = run and (run.group(1) or run.group(2))
+                    if group in remaining:
+                        # Extract timestamp from the log line
+                        match = LOG_TIMESTAMP_RE.match(line)
+                        if not match:
+                            continue
+                        try:
+                            last_run = datetime(*map(int, match.groups()))
+                            groups_data[group]['last_run'] = match.group(0)
+                            
+                            # Calculate next run based on interval
+                            if 'run_interval' in groups_data[group]:
+                                interval_seconds = groups_data[group]['run_interval']
+                                next_run = last_run + timedelta(seconds=interval_seconds)
+                                groups_data[group]['next_run'] = next_run.isoformat(sep=' ', timespec='seconds')
+                                
+                            remaining.discard(group)  # Found the most recent entry
+                        except Exception as e:
+                            logger.error(f"Error parsing timestamp for group {group}: {str(e)}")
                     
-                    # Search for the last run of each group
-                    for group in groups_data:
-                        # Look for both new and old format log entries
-                        search_terms = [
-                            f"Using channel group {group} configuration",  # New format
-                            f"Using channel group {group} configuration: channels-{group}.json",  # Explicit new format
-                            f"Using legacy channel group {group} configuration: channels{group}.json"  # Legacy format
-                        ]
-                        
-                        for line in reversed(log_content):  # Start from the end
-                            if any(term in line for term in search_terms):
-                                # Extract timestamp from the log line
-                                timestamp_str = line.split(' - ')[0].strip()
-                                try:
-                                    last_run = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                                    groups_data[group]['last_run'] = last_run.strftime('%Y-%m-%d %H:%M:%S')
-                                    
-                                    # Calculate next run based on interval
-                                    if 'run_interval' in groups_data[group]:
-                                        interval_seconds = groups_data[group]['run_interval']
-                                        next_run = last_run + timedelta(seconds=interval_seconds)
-                                        groups_data[group]['next_run'] = next_run.strftime('%Y-%m-%d %H:%M:%S')
-                                        
-                                    break  # Found the most recent entry
-                                except Exception as e:
-                                    logger.error(f"Error parsing timestamp for group {group}: {str(e)}")
+                    if not remaining:
+                        break
             except Exception as e:
                 logger.error(f"Error reading log file for group run times: {str(e)}")
         
         # Save to database for history
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            for group, data in groups_data.items():
-                channels_json = json.dumps(data['channels'])
-                publish_days_json = json.dumps(data['publish_days'])
-                
-                cursor.execute('''
-                INSERT INTO channel_groups (
-                    timestamp, group_name, channels, publish_days, last_run, next_run
-                ) VALUES (?, ?, ?, ?, ?, ?)
-                ''', (timestamp, group, channels_json, publish_days_json, 
-                      data.get('last_run'), data.get('next_run')))
-            
-            conn.commit()
+        timestamp = _now_str()
+        group_rows = [
+            (timestamp, group, orjson.dumps(data['channels']).decode(), orjson.dumps(data['publish_days']).decode(),
+             data.get('last_run'), data.get('next_run'))
+            for group, data in groups_data.items()
+        ]
+        
+        if group_rows:
+            queue_history_write('''
+            INSERT INTO channel_groups (
+                timestamp, group_name, channels, publish_days, last_run, next_run
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            ''', group_rows)
             
         return groups_data
                 
@@ -1544,18 +2143,16 @@ def get_channel_groups():
 def record_cleanup_operation(directory, files_removed, space_freed_mb, retention_days):
     """Record a file cleanup operation in the database."""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            cursor.execute('''
-            INSERT INTO file_cleanup (
-                timestamp, directory, files_removed, space_freed_mb, retention_days
-            ) VALUES (?, ?, ?, ?, ?)
-            ''', (timestamp, directory, files_removed, space_freed_mb, retention_days))
-            
-            conn.commit()
-            
+        timestamp = _now_str()
+        
+        # Cleanup stats are refreshed once the row is actually committed
+        queue_history_write('''
+        INSERT INTO file_cleanup (
+            timestamp, directory, files_removed, space_freed_mb, retention_days
+        ) VALUES (?, ?, ?, ?, ?)
+        ''', [(timestamp, directory, files_removed, space_freed_mb, retention_days)],
+            on_commit=get_cleanup_stats.cache_clear)
+        
         logger.info(f"Recorded cleanup operation: {files_removed} files, {space_freed_mb:.2f} MB freed")
         return True
                 
@@ -1568,25 +2165,25 @@ def record_cleanup_operation(directory, files_removed, space_freed_mb, retention
 def api_quota():
     """API endpoint for YouTube API quota information."""
     quota_data = get_youtube_api_quota()
-    return jsonify(quota_data)
+    return json_response(quota_data)
 
 @app.route('/api/thresholds')
 def api_thresholds():
     """API endpoint for dynamic view thresholds."""
     thresholds_data = get_dynamic_thresholds()
-    return jsonify(thresholds_data)
+    return json_response(thresholds_data)
 
 @app.route('/api/cleanup')
 def api_cleanup():
     """API endpoint for file cleanup statistics."""
     cleanup_data = get_cleanup_stats()
-    return jsonify(cleanup_data)
+    return json_response(cleanup_data)
 
 @app.route('/api/groups')
 def api_groups():
     """API endpoint for channel groups information."""
     groups_data = get_channel_groups()
-    return jsonify(groups_data)
+    return json_response(groups_data)
 
 if __name__ == '__main__':
     run_dashboard(host='0.0.0.0', debug=True) 
\ No newline at end of file
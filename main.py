@@ -9,18 +9,23 @@ import os
 import sys
 import json
 import time
+import random
 import signal
 import asyncio
 import logging
 import argparse
+import multiprocessing
+import functools
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 import shutil
+import numpy as np
 
 from tiktok_scraper import TikTokScraper
 from content_analyzer import ContentAnalyzer
 from video_processor import VideoProcessor
-from youtube_uploader import YouTubeUploader
+from youtube_uploader import YouTubeUploader, write_json_atomic
 from video_history import VideoHistory
 import config
 from dashboard import start_dashboard_thread, update_processing_stats, record_upload, record_cleanup_operation
@@ -39,9 +44,16 @@ logger = logging.getLogger(__name__)
 # Global flag for shutdown
 shutdown_requested = False
 
+# Marker file whose mtime records the last cleanup of a directory
+CLEANUP_MARKER = ".last_cleanup"
+
+# Cached YouTube existence checks: youtube_id -> [exists, checked_at unix time]
+EXISTENCE_CACHE_FILE = ".yt_existence_cache.json"
+EXISTENCE_CACHE_TTL = 7 * 86400
+# Uploads older than a year rarely disappear, so they are re-checked less often
+EXISTENCE_CACHE_TTL_OLD = 30 * 86400
+
 # Quota tracking variables
-QUOTA_LOG_FILE = "youtube_api_quota.json"
-DAILY_QUOTA_LIMIT = 10000
 # Estimated quota costs per operation
 QUOTA_COST = {
     "upload_video": 1600,
@@ -50,6 +62,97 @@ QUOTA_COST = {
     "list_videos": 1
 }
 
+# Video processing is CPU-bound, so it runs in a pool of worker processes
+_process_pool = None
+# Per-worker VideoProcessor, created on first use inside each worker process
+_worker_processor = None
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared video processing pool, creating it on first use.
+    
+    Returns:
+        ProcessPoolExecutor: Pool with one worker per CPU core
+    """
+    global _process_pool
+    if _process_pool is None:
+        # Spawn rather than fork: the dashboard and history writer threads may hold locks
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+    return _process_pool
+
+def _process_video_worker(video_file: str, **kwargs) -> str:
+    """
+    Process a video inside a pool worker with that worker's own VideoProcessor.
+    
+    Args:
+        video_file (str): Path to the downloaded video
+        **kwargs: Processing options passed to VideoProcessor.process_video
+        
+    Returns:
+        str: Path to the processed video, or None if processing failed
+    """
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = VideoProcessor()
+    return _worker_processor.process_video(video_file, **kwargs)
+
+class QuotaBucket:
+    """Hands out the day's YouTube API quota to uploads before they start."""
+    
+    def __init__(self, uploader: YouTubeUploader):
+        """
+        Initialize the bucket.
+        
+        Args:
+            uploader (YouTubeUploader): Uploader whose usage log tracks the quota
+        """
+        self.uploader = uploader
+        # Units handed out to uploads that have not finished yet, so they are not in the log
+        self.reserved = 0
+        # The uploader refuses uploads that would eat into the last 5% of the day
+        self.floor = uploader.daily_quota_limit * 0.05
+    
+    def available(self) -> float:
+        """
+        Get the quota units that can still be handed out.
+        
+        The usage log is shared by every channel-group process, so reading it
+        each time also accounts for what the others have spent.
+        
+        Returns:
+            float: Units available right now
+        """
+        return self.uploader.get_remaining_quota() - self.floor - self.reserved
+    
+    def acquire(self, cost: float) -> bool:
+        """
+        Reserve quota for one operation.
+        
+        Never waits for the quota to reset: callers hold the channel semaphore,
+        so they skip the work instead and the next daemon cycle retries it.
+        
+        Args:
+            cost (float): Quota units the operation will use
+            
+        Returns:
+            bool: True if the units are reserved, False if the quota ran out
+        """
+        if self.available() < cost:
+            return False
+        
+        # Checked and reserved without yielding to the event loop, so other channels cannot overdraw
+        self.reserved += cost
+        return True
+    
+    def release(self, cost: float):
+        """
+        Return a reservation once the operation is over and the uploader has logged it.
+        
+        Args:
+            cost (float): Quota units that were reserved
+        """
+        self.reserved -= cost
+
 def signal_handler(sig, frame):
     """Handle SIGINT (Ctrl+C) and SIGTERM signals."""
     global shutdown_requested
@@ -140,6 +243,280 @@ async def scrape_tiktok_channels(scraper: TikTokScraper, channels: List[str], li
     
     return channel_videos
 
+async def process_channel(channel: Dict[str, Any], settings: Dict[str, Any], scraper: TikTokScraper,
+                          analyzer: ContentAnalyzer, uploader: YouTubeUploader, upload_lock: asyncio.Lock,
+                          quota: QuotaBucket):
+    """
+    Scrape, select, download, process and upload the videos of one channel.
+    
+    Args:
+        channel (Dict[str, Any]): Channel configuration
+        settings (Dict[str, Any]): Global settings
+        scraper (TikTokScraper): TikTok scraper instance
+        analyzer (ContentAnalyzer): Content analyzer instance
+        uploader (YouTubeUploader): YouTube uploader instance
+        upload_lock (asyncio.Lock): Held while uploading; the uploader's API client is not thread-safe
+        quota (QuotaBucket): Quota reserved before each upload
+        
+    Returns:
+        tuple: Number of videos processed, uploaded and failed for the channel
+    """
+    uploaded_count = 0
+    failed_count = 0
+    
+    channel_name = channel.get("channel_name", "")
+    username = channel.get("username", "")
+    limit = channel.get("limit", settings.get("scrape_limit", 20))
+    add_watermark = channel.get("add_watermark", settings.get("add_watermark", True))
+    add_credits = channel.get("add_credits", settings.get("add_credits", True))
+    
+    # Skip inactive channels
+    if not channel.get("active", True):
+        logger.info(f"Skipping inactive channel: {channel_name} (@{username})")
+        return 0, 0, 0
+        
+    log_separator()
+    logger.info(f"Processing channel: {channel_name} (@{username})")
+    
+    # 1. Scrape videos
+    try:
+        videos = await scraper.get_user_videos(username, limit)
+        logger.info(f"Retrieved {len(videos)} videos from {username}")
+        
+        # Update dashboard with channel stats
+        if videos:
+            # Columns: views, likes, comments, shares, duration
+            stats = np.array([
+                (
+                    v.get('stats', {}).get('playCount', 0),
+                    v.get('stats', {}).get('diggCount', 0),
+                    v.get('stats', {}).get('commentCount', 0),
+                    v.get('stats', {}).get('shareCount', 0),
+                    v.get('video', {}).get('duration', 0)
+                )
+                for v in videos
+            ], dtype=np.float64)
+            avg_views, avg_likes, avg_comments, avg_shares, avg_duration = (float(m) for m in stats.mean(axis=0))
+            
+            # Calculate engagement rate (likes + comments + shares) / views * 100
+            engagement_metrics = stats[:, 1:4].sum(axis=1) / np.maximum(1, stats[:, 0]) * 100
+            avg_engagement = float(engagement_metrics.mean())
+            
+            channel_stats = {
+                "total_videos": len(videos),
+                "avg_views": avg_views,
+                "avg_likes": avg_likes,
+                "avg_comments": avg_comments,
+                "avg_shares": avg_shares,
+                "avg_duration": avg_duration,
+                "avg_engagement_rate": avg_engagement
+            }
+            
+            logger.info(f"Channel {username} statistics: {json.dumps(channel_stats, indent=2)}")
+            
+    except Exception as e:
+        logger.error(f"Error scraping channel {username}: {str(e)}", exc_info=True)
+        return 0, 0, 0
+        
+    # Exit if no videos found
+    if not videos:
+        logger.warning(f"No videos found for channel {username}")
+        return 0, 0, 0
+        
+    # 2. Filter out previously uploaded videos
+    filtered_videos = video_history.filter_previously_uploaded(videos, username)
+    logger.info(f"Found {len(filtered_videos)} new videos for channel {username}")
+    
+    if not filtered_videos:
+        logger.info(f"No new videos to process for {username}")
+        return 0, 0, 0
+        
+    # 3. Analyze and select top videos
+    try:
+        logger.info(f"Analyzing {len(filtered_videos)} videos from {username}")
+        top_videos = analyzer.select_top_videos(
+            filtered_videos, 
+            channel_name,
+            settings.get("top_videos_per_channel", 3)
+        )
+        
+        if not top_videos:
+            logger.warning(f"No videos selected for {username} after content analysis")
+            return 0, 0, 0
+            
+        # Log selected videos
+        for i, video in enumerate(top_videos):
+            views = video.get('stats', {}).get('playCount', 0)
+            likes = video.get('stats', {}).get('diggCount', 0)
+            comments = video.get('stats', {}).get('commentCount', 0)
+            logger.info(f"Channel {username}: Selected #{i+1}: Score: {video.get('engagement_score', 0):.2f}, Views: {views}, Likes: {likes}, Comments: {comments}")
+        
+    except Exception as e:
+        logger.error(f"Error analyzing videos for {username}: {str(e)}", exc_info=True)
+        return 0, 0, 0
+        
+    # 4. Download videos concurrently, a few at a time so the CDN doesn't rate-limit us
+    downloaded_videos = []
+    download_data = []
+    download_semaphore = asyncio.Semaphore(settings.get("download_concurrency", 3))
+    
+    async def download(video):
+        video_url = video.get('url', '')
+        if not video_url:
+            logger.warning(f"Missing URL for video in channel {username}")
+            return None
+        
+        async with download_semaphore:
+            if shutdown_requested:
+                logger.info("Shutdown requested, skipping video download")
+                return None
+                
+            logger.info(f"Downloading video: {video_url}")
+            video_file = await scraper.download_video(video_url, username)
+        
+        if not video_file:
+            logger.error(f"Failed to download video: {video_url}")
+        return video_file
+    
+    results = await asyncio.gather(*(download(video) for video in top_videos), return_exceptions=True)
+    
+    # Keep the downloads paired with their video data, in selection order
+    for video, result in zip(top_videos, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error downloading video: {str(result)}", exc_info=result)
+        elif result:
+            downloaded_videos.append(result)
+            download_data.append(video)
+    
+    # Exit if no videos were downloaded
+    if not downloaded_videos:
+        logger.warning(f"No videos downloaded for channel {username}")
+        return 0, 0, 0
+        
+    # 5. Process videos (add watermark, credits, etc.)
+    processed_videos = []
+    processed_data = []
+    
+    # Skip processing if not adding watermark or credits
+    if not add_watermark and not add_credits:
+        logger.info(f"Skipping video processing for channel {username} (add_credits={add_credits}, add_watermark={add_watermark})")
+        
+        # Just copy the original files to processed directory
+        for video_file, video in zip(downloaded_videos, download_data):
+            try:
+                # Create output filename with _direct suffix to indicate no processing
+                filename = os.path.basename(video_file)
+                name, ext = os.path.splitext(filename)
+                processed_file = os.path.join("processed", username, f"{name}_direct{ext}")
+                
+                # Create the directory if it doesn't exist
+                os.makedirs(os.path.dirname(processed_file), exist_ok=True)
+                
+                # Copy the file
+                shutil.copy2(video_file, processed_file)
+                logger.info(f"Copied original video to processed directory: {processed_file}")
+                
+                processed_videos.append(processed_file)
+                processed_data.append(video)
+            except Exception as e:
+                logger.error(f"Error copying video file: {str(e)}", exc_info=True)
+    else:
+        # Process videos with watermark/credits as configured, in parallel worker processes
+        loop = asyncio.get_running_loop()
+        pool = get_process_pool()
+        
+        async def process(video_file):
+            if shutdown_requested:
+                logger.info("Shutdown requested, skipping video processing")
+                return None
+                
+            logger.info(f"Processing video: {video_file}")
+            processed_file = await loop.run_in_executor(pool, functools.partial(
+                _process_video_worker,
+                video_file,
+                add_watermark=add_watermark,
+                add_credits=add_credits,
+                creator=username
+            ))
+            
+            if processed_file:
+                logger.info(f"Successfully processed video: {processed_file}")
+            else:
+                logger.error(f"Failed to process video: {video_file}")
+            return processed_file
+        
+        results = await asyncio.gather(*(process(video_file) for video_file in downloaded_videos), return_exceptions=True)
+        
+        # Keep the processed files paired with their video data for the uploads
+        for video, result in zip(download_data, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error processing video: {str(result)}", exc_info=result)
+            elif result:
+                processed_videos.append(result)
+                processed_data.append(video)
+    
+    # Exit if no videos were processed
+    if not processed_videos:
+        logger.warning(f"No videos processed for channel {username}")
+        return 0, 0, 0
+        
+    # 6. Upload videos to YouTube
+    if settings.get("upload", True) and not shutdown_requested:
+        logger.info(f"Uploading {len(processed_videos)} videos to YouTube")
+        
+        for i, (processed_file, video) in enumerate(zip(processed_videos, processed_data)):
+            if shutdown_requested:
+                logger.info("Shutdown requested, stopping uploads")
+                break
+                
+            # Reserve quota per upload so a short quota skips instead of failing mid-batch
+            if not quota.acquire(QUOTA_COST["upload_video"]):
+                logger.warning(f"Not enough YouTube API quota, skipping {len(processed_videos) - i} remaining uploads for {username} until the next cycle")
+                break
+            
+            title = video.get('caption', 'Unknown title')
+            try:
+                # The upload blocks for minutes, so run it in a thread to keep the other channels moving
+                async with upload_lock:
+                    upload_results = await asyncio.to_thread(uploader._upload_immediately, [processed_file], [video])
+                
+                for result in upload_results.get("successful", []):
+                    video_id = result.get("video_id")
+                    
+                    # Record in video history
+                    video_history.record_uploaded_video({
+                        "tiktok_url": video.get('url', ''),
+                        "youtube_id": video_id,
+                        "title": title,
+                        "channel": username,
+                        "upload_date": datetime.now().isoformat()
+                    })
+                    
+                    # Update dashboard
+                    record_upload(title, username, "success", video_id)
+                    uploaded_count += 1
+                    
+                for result in upload_results.get("failed", []):
+                    record_upload(title, username, "failed")
+                    failed_count += 1
+                    
+            except Exception as e:
+                logger.error(f"Error uploading video {processed_file}: {str(e)}", exc_info=True)
+                record_upload(title, username, "failed")
+                failed_count += 1
+            finally:
+                quota.release(QUOTA_COST["upload_video"])
+            
+            # Add a delay between uploads to avoid rate limits
+            if i < len(processed_videos) - 1:
+                await asyncio.sleep(random.randint(3, 10))
+                
+        logger.info(f"Uploaded {uploaded_count} videos, {failed_count} failed")
+    else:
+        logger.info("Uploads are disabled, skipping upload step")
+        
+    return len(processed_videos), uploaded_count, failed_count
+
 async def process_channels(config_data: Dict[str, Any]):
     """
     Process all channels in the configuration.
@@ -162,249 +539,35 @@ async def process_channels(config_data: Dict[str, Any]):
         # Initialize module objects
         scraper = TikTokScraper(config_data)
         analyzer = ContentAnalyzer()
-        processor = VideoProcessor()
         uploader = YouTubeUploader()
+        upload_lock = asyncio.Lock()
+        # Shared by all channels so concurrent uploads cannot overdraw the day's quota
+        quota = QuotaBucket(uploader)
         
         # Log starting session
         log_separator()
         logger.info(f"Starting processing session for {len(channels)} channels")
         
-        # Process each channel
-        for channel in channels:
-            if shutdown_requested:
-                logger.info("Shutdown requested, stopping channel processing")
-                break
-                
-            channel_name = channel.get("channel_name", "")
-            username = channel.get("username", "")
-            limit = channel.get("limit", settings.get("scrape_limit", 20))
-            add_watermark = channel.get("add_watermark", settings.get("add_watermark", True))
-            add_credits = channel.get("add_credits", settings.get("add_credits", True))
-            
-            # Skip inactive channels
-            if not channel.get("active", True):
-                logger.info(f"Skipping inactive channel: {channel_name} (@{username})")
-                continue
-                
-            log_separator()
-            logger.info(f"Processing channel: {channel_name} (@{username})")
-            
-            # 1. Scrape videos
-            try:
-                videos = await scraper.get_user_videos(username, limit)
-                logger.info(f"Retrieved {len(videos)} videos from {username}")
-                
-                # Update dashboard with channel stats
-                if videos:
-                    views = [v.get('stats', {}).get('playCount', 0) for v in videos]
-                    likes = [v.get('stats', {}).get('diggCount', 0) for v in videos]
-                    comments = [v.get('stats', {}).get('commentCount', 0) for v in videos]
-                    shares = [v.get('stats', {}).get('shareCount', 0) for v in videos]
-                    duration = [v.get('video', {}).get('duration', 0) for v in videos]
-                    
-                    avg_views = sum(views) / len(views) if views else 0
-                    avg_likes = sum(likes) / len(likes) if likes else 0
-                    avg_comments = sum(comments) / len(comments) if comments else 0
-                    avg_shares = sum(shares) / len(shares) if shares else 0
-                    avg_duration = sum(duration) / len(duration) if duration else 0
-                    
-                    # Calculate engagement rate (likes + comments + shares) / views * 100
-                    engagement_metrics = [(likes[i] + comments[i] + shares[i]) / max(1, views[i]) * 100 
-                                         for i in range(len(views))]
-                    avg_engagement = sum(engagement_metrics) / len(engagement_metrics) if engagement_metrics else 0
-                    
-                    channel_stats = {
-                        "total_videos": len(videos),
-                        "avg_views": avg_views,
-                        "avg_likes": avg_likes,
-                        "avg_comments": avg_comments,
-                        "avg_shares": avg_shares,
-                        "avg_duration": avg_duration,
-                        "avg_engagement_rate": avg_engagement
-                    }
-                    
-                    logger.info(f"Channel {username} statistics: {json.dumps(channel_stats, indent=2)}")
-                    
-            except Exception as e:
-                logger.error(f"Error scraping channel {username}: {str(e)}", exc_info=True)
-                continue
-                
-            # Exit if no videos found
-            if not videos:
-                logger.warning(f"No videos found for channel {username}")
-                continue
-                
-            # 2. Filter out previously uploaded videos
-            filtered_videos = video_history.filter_previously_uploaded(videos, username)
-            logger.info(f"Found {len(filtered_videos)} new videos for channel {username}")
-            
-            if not filtered_videos:
-                logger.info(f"No new videos to process for {username}")
-                continue
-                
-            # 3. Analyze and select top videos
-            try:
-                logger.info(f"Analyzing {len(filtered_videos)} videos from {username}")
-                top_videos = analyzer.select_top_videos(
-                    filtered_videos, 
-                    channel_name,
-                    settings.get("top_videos_per_channel", 3)
-                )
-                
-                if not top_videos:
-                    logger.warning(f"No videos selected for {username} after content analysis")
-                    continue
-                    
-                # Log selected videos
-                for i, video in enumerate(top_videos):
-                    views = video.get('stats', {}).get('playCount', 0)
-                    likes = video.get('stats', {}).get('diggCount', 0)
-                    comments = video.get('stats', {}).get('commentCount', 0)
-                    logger.info(f"Channel {username}: Selected #{i+1}: Score: {video.get('engagement_score', 0):.2f}, Views: {views}, Likes: {likes}, Comments: {comments}")
-                
-            except Exception as e:
-                logger.error(f"Error analyzing videos for {username}: {str(e)}", exc_info=True)
-                continue
-                
-            # 4. Download videos
-            downloaded_videos = []
-            download_data = []
-            
-            for video in top_videos:
+        # Process channels concurrently; the work is mostly network-bound, so cap it to avoid rate limits
+        semaphore = asyncio.Semaphore(settings.get("channel_concurrency", 4))
+        
+        async def process_with_limit(channel):
+            async with semaphore:
                 if shutdown_requested:
-                    logger.info("Shutdown requested, stopping video downloads")
-                    break
-                    
-                try:
-                    video_url = video.get('url', '')
-                    if not video_url:
-                        logger.warning(f"Missing URL for video in channel {username}")
-                        continue
-                        
-                    logger.info(f"Downloading video: {video_url}")
-                    video_file = await scraper.download_video(video_url, username)
-                    
-                    if video_file:
-                        downloaded_videos.append(video_file)
-                        download_data.append(video)
-                    else:
-                        logger.error(f"Failed to download video: {video_url}")
-                        
-                except Exception as e:
-                    logger.error(f"Error downloading video: {str(e)}", exc_info=True)
-            
-            # Exit if no videos were downloaded
-            if not downloaded_videos:
-                logger.warning(f"No videos downloaded for channel {username}")
-                continue
-                
-            # 5. Process videos (add watermark, credits, etc.)
-            processed_videos = []
-            
-            # Skip processing if not adding watermark or credits
-            if not add_watermark and not add_credits:
-                logger.info(f"Skipping video processing for channel {username} (add_credits={add_credits}, add_watermark={add_watermark})")
-                
-                # Just copy the original files to processed directory
-                for video_file in downloaded_videos:
-                    try:
-                        # Create output filename with _direct suffix to indicate no processing
-                        filename = os.path.basename(video_file)
-                        name, ext = os.path.splitext(filename)
-                        processed_file = os.path.join("processed", username, f"{name}_direct{ext}")
-                        
-                        # Create the directory if it doesn't exist
-                        os.makedirs(os.path.dirname(processed_file), exist_ok=True)
-                        
-                        # Copy the file
-                        shutil.copy2(video_file, processed_file)
-                        logger.info(f"Copied original video to processed directory: {processed_file}")
-                        
-                        processed_videos.append(processed_file)
-                    except Exception as e:
-                        logger.error(f"Error copying video file: {str(e)}", exc_info=True)
-            else:
-                # Process videos with watermark/credits as configured
-                for video_file in downloaded_videos:
-                    if shutdown_requested:
-                        logger.info("Shutdown requested, stopping video processing")
-                        break
-                        
-                    try:
-                        logger.info(f"Processing video: {video_file}")
-                        
-                        # Process the video
-                        processed_file = processor.process_video(
-                            video_file,
-                            add_watermark=add_watermark,
-                            add_credits=add_credits,
-                            creator=username
-                        )
-                        
-                        if processed_file:
-                            processed_videos.append(processed_file)
-                            logger.info(f"Successfully processed video: {processed_file}")
-                        else:
-                            logger.error(f"Failed to process video: {video_file}")
-                            
-                    except Exception as e:
-                        logger.error(f"Error processing video: {str(e)}", exc_info=True)
-            
-            # Exit if no videos were processed
-            if not processed_videos:
-                logger.warning(f"No videos processed for channel {username}")
+                    logger.info("Shutdown requested, skipping channel processing")
+                    return 0, 0, 0
+                return await process_channel(channel, settings, scraper, analyzer, uploader, upload_lock, quota)
+        
+        results = await asyncio.gather(*(process_with_limit(channel) for channel in channels), return_exceptions=True)
+        
+        for channel, result in zip(channels, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error processing channel {channel.get('username', '')}: {str(result)}", exc_info=result)
                 continue
-                
-            # 6. Upload videos to YouTube
-            if settings.get("upload", True) and not shutdown_requested:
-                try:
-                    logger.info(f"Uploading {len(processed_videos)} videos to YouTube")
-                    upload_results = uploader._upload_immediately(processed_videos, download_data)
-                    
-                    # Get results
-                    successful = upload_results.get("successful", [])
-                    failed = upload_results.get("failed", [])
-                    
-                    logger.info(f"Uploaded {len(successful)} videos, {len(failed)} failed")
-                    
-                    # Record upload stats for dashboard
-                    for video in successful:
-                        video_id = video.get("video_id")
-                        title = video.get("title", "Unknown title")
-                        
-                        # Record in video history
-                        video_history.record_uploaded_video({
-                            "tiktok_url": download_data[0].get('url', ''),
-                            "youtube_id": video_id,
-                            "title": title,
-                            "channel": username,
-                            "upload_date": datetime.now().isoformat()
-                        })
-                        
-                        # Update dashboard
-                        record_upload(title, username, "success", video_id)
-                        
-                    for video in failed:
-                        title = video.get("title", "Unknown title")
-                        record_upload(title, username, "failed")
-                    
-                    # Update counters
-                    total_uploaded += len(successful)
-                    total_failed += len(failed)
-                    
-                except Exception as e:
-                    logger.error(f"Error uploading videos: {str(e)}", exc_info=True)
-                    total_failed += len(processed_videos)
-                    
-                    # Record failed uploads
-                    for video in download_data:
-                        title = video.get('caption', 'Unknown title')
-                        record_upload(title, username, "failed")
-            else:
-                logger.info("Uploads are disabled, skipping upload step")
-                
-            # Increment processed count
-            total_processed += len(processed_videos)
+            processed, uploaded, failed = result
+            total_processed += processed
+            total_uploaded += uploaded
+            total_failed += failed
             
         # Log session summary
         log_separator()
@@ -423,27 +586,39 @@ async def process_channels(config_data: Dict[str, Any]):
             await check_deleted_videos()
             
             # Clean up old files
-            await cleanup_old_files("downloads", days_to_keep)
-            await cleanup_old_files("processed", days_to_keep)
+            min_interval = settings.get("min_cleanup_interval", 21600)  # Default: 6 hours
+            await cleanup_old_files("downloads", days_to_keep, min_interval)
+            await cleanup_old_files("processed", days_to_keep, min_interval)
             
     except Exception as e:
         logger.error(f"Error in process_channels: {str(e)}", exc_info=True)
         
     return total_processed, total_uploaded, total_failed
 
-async def cleanup_old_files(directory: str, days: int):
+async def cleanup_old_files(directory: str, days: int, min_interval: int = 0):
     """
     Clean up files older than specified days to save disk space.
     
     Args:
         directory (str): Directory path to clean
         days (int): Age in days after which files should be removed
+        min_interval (int): Skip the cleanup if the last one in this directory
+            finished less than this many seconds ago
     """
     try:
         if not os.path.exists(directory):
             logger.info(f"Directory does not exist, no cleanup needed: {directory}")
             return {"files_removed": 0, "space_freed_mb": 0}
             
+        # The marker's mtime records when this directory was last cleaned
+        marker_path = os.path.join(directory, CLEANUP_MARKER)
+        try:
+            if time.time() - os.path.getmtime(marker_path) < min_interval:
+                logger.info(f"Skipping cleanup of {directory}, last run was less than {min_interval} seconds ago")
+                return {"files_removed": 0, "space_freed_mb": 0}
+        except OSError:
+            pass
+            
         # Calculate cutoff time
         cutoff_time = time.time() - (days * 86400)  # 86400 seconds in a day
         
@@ -451,42 +626,52 @@ async def cleanup_old_files(directory: str, days: int):
         file_count = 0
         size_cleaned = 0
         
+        old_files = []
+        subdirs = []
+        
+        def _scan(path):
+            # One stat per entry; DirEntry caches it and is_dir() needs no extra syscall
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            _scan(entry.path)
+                        elif entry.path != marker_path:
+                            st = entry.stat(follow_symlinks=False)
+                            if st.st_mtime < cutoff_time:
+                                old_files.append((entry.path, st.st_size))
+                    except Exception as e:
+                        logger.warning(f"Could not get modification time for {entry.path}: {str(e)}")
+        
         # Walk through all subdirectories
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                file_path = os.path.join(root, file)
+        _scan(directory)
+        
+        for file_path, file_size in old_files:
+            try:
+                # Delete the file
+                os.unlink(file_path)
                 
-                try:
-                    # Check file modification time
-                    file_time = os.path.getmtime(file_path)
-                    
-                    if file_time < cutoff_time:
-                        try:
-                            # Get file size before deletion for reporting
-                            file_size = os.path.getsize(file_path)
-                            
-                            # Delete the file
-                            os.remove(file_path)
-                            
-                            file_count += 1
-                            size_cleaned += file_size
-                            
-                            logger.debug(f"Deleted old file: {file_path}")
-                        except Exception as e:
-                            logger.warning(f"Failed to delete file {file_path}: {str(e)}")
-                except Exception as e:
-                    logger.warning(f"Could not get modification time for {file_path}: {str(e)}")
-            
-            # Check for and remove empty directories
-            for dir_name in dirs[:]:  # Create a copy of dirs to avoid modification during iteration
-                dir_path = os.path.join(root, dir_name)
-                try:
-                    # Check if directory is empty
-                    if not os.listdir(dir_path):
-                        os.rmdir(dir_path)
-                        logger.debug(f"Removed empty directory: {dir_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to remove empty directory {dir_path}: {str(e)}")
+                file_count += 1
+                size_cleaned += file_size
+                
+                logger.debug(f"Deleted old file: {file_path}")
+            except Exception as e:
+                logger.warning(f"Failed to delete file {file_path}: {str(e)}")
+        
+        # Check for and remove empty directories, deepest first
+        for dir_path in reversed(subdirs):
+            try:
+                # Check if directory is empty
+                if not os.listdir(dir_path):
+                    os.rmdir(dir_path)
+                    logger.debug(f"Removed empty directory: {dir_path}")
+            except Exception as e:
+                logger.warning(f"Failed to remove empty directory {dir_path}: {str(e)}")
+        
+        # Record the successful run
+        with open(marker_path, 'w') as f:
+            f.write(str(int(time.time())))
         
         # Convert bytes to MB for logging
         size_cleaned_mb = size_cleaned / (1024 * 1024)
@@ -575,176 +760,75 @@ async def check_deleted_videos():
         logger.info(f"Checking {len(uploaded_videos)} videos for deletion status")
         deleted_count = 0
         
-        # Check each video
+        existence_cache = load_existence_cache()
+        now = time.time()
+        year_ago = (datetime.now() - timedelta(days=365)).isoformat()
+        
+        # Only re-check videos whose cached result has expired
+        youtube_ids = []
         for video in uploaded_videos:
-            if shutdown_requested:
-                logger.info("Shutdown requested, stopping deleted video check")
-                break
-                
             youtube_id = video.get('youtube_id')
             if not youtube_id:
                 continue
+            upload_date = video.get('upload_date')
+            ttl = EXISTENCE_CACHE_TTL_OLD if upload_date and upload_date < year_ago else EXISTENCE_CACHE_TTL
+            cached = existence_cache.get(youtube_id)
+            if cached is None or now - cached[1] >= ttl:
+                youtube_ids.append(youtube_id)
+        
+        logger.info(f"{len(uploaded_videos) - len(youtube_ids)} videos checked recently, querying YouTube for {len(youtube_ids)}")
+        
+        # Check the videos 50 at a time, one videos.list call per batch
+        for i in range(0, len(youtube_ids), 50):
+            if shutdown_requested:
+                logger.info("Shutdown requested, stopping deleted video check")
+                break
                 
-            # Check if video still exists
-            exists = uploader.check_video_exists(youtube_id)
-            if not exists:
-                deleted_count += 1
-                logger.info(f"Video {youtube_id} confirmed as deleted from YouTube")
+            batch_ids = youtube_ids[i:i+50]
+            results = uploader.check_videos_exist(batch_ids)
+            
+            for youtube_id, exists in results.items():
+                existence_cache[youtube_id] = [exists, now]
+                if not exists:
+                    deleted_count += 1
+                    logger.info(f"Video {youtube_id} confirmed as deleted from YouTube")
+        
+        # Forget videos that are no longer in the history
+        uploaded_ids = {video.get('youtube_id') for video in uploaded_videos}
+        save_existence_cache({k: v for k, v in existence_cache.items() if k in uploaded_ids})
                 
         logger.info(f"Deleted video check completed. Found {deleted_count} deleted videos.")
     
     except Exception as e:
         logger.error(f"Error checking for deleted videos: {str(e)}", exc_info=True)
 
-def load_quota_usage():
+def load_existence_cache():
     """
-    Load the current day's YouTube API quota usage from the log file.
+    Load cached YouTube existence checks from disk.
     
     Returns:
-        dict: Current quota usage information
-    """
-    try:
-        if os.path.exists(QUOTA_LOG_FILE):
-            with open(QUOTA_LOG_FILE, 'r') as f:
-                quota_data = json.load(f)
-                
-            # Check if we have data for today
-            today = datetime.now().strftime('%Y-%m-%d')
-            if today in quota_data:
-                return quota_data
-            else:
-                # New day, start fresh but keep history
-                quota_data[today] = {
-                    "used": 0,
-                    "operations": {},
-                    "remaining": DAILY_QUOTA_LIMIT,
-                    "last_updated": datetime.now().isoformat()
-                }
-                return quota_data
-        else:
-            # Create new log file with today's entry
-            today = datetime.now().strftime('%Y-%m-%d')
-            quota_data = {
-                today: {
-                    "used": 0,
-                    "operations": {},
-                    "remaining": DAILY_QUOTA_LIMIT,
-                    "last_updated": datetime.now().isoformat()
-                }
-            }
-            return quota_data
-    except Exception as e:
-        logger.error(f"Error loading quota usage data: {str(e)}")
-        # Return a default structure
-        today = datetime.now().strftime('%Y-%m-%d')
-        return {
-            today: {
-                "used": 0, 
-                "operations": {}, 
-                "remaining": DAILY_QUOTA_LIMIT,
-                "last_updated": datetime.now().isoformat()
-            }
-        }
-
-def save_quota_usage(quota_data):
-    """
-    Save the updated quota usage to the log file.
-    
-    Args:
-        quota_data (dict): Quota usage information to save
+        dict: Mapping of youtube_id to [exists, checked_at]
     """
     try:
-        with open(QUOTA_LOG_FILE, 'w') as f:
-            json.dump(quota_data, f, indent=2)
-        logger.debug("Quota usage data saved")
+        if os.path.exists(EXISTENCE_CACHE_FILE):
+            with open(EXISTENCE_CACHE_FILE, 'r') as f:
+                return json.load(f)
     except Exception as e:
-        logger.error(f"Error saving quota usage data: {str(e)}")
+        logger.error(f"Error loading video existence cache: {str(e)}")
+    return {}
 
-def track_api_usage(operation, count=1):
+def save_existence_cache(cache):
     """
-    Track YouTube API usage for quota monitoring.
+    Save cached YouTube existence checks to disk.
     
     Args:
-        operation (str): The API operation performed
-        count (int): Number of times the operation was performed
+        cache (dict): Mapping of youtube_id to [exists, checked_at]
     """
     try:
-        # Load current usage
-        quota_data = load_quota_usage()
-        today = datetime.now().strftime('%Y-%m-%d')
-        
-        # Get cost of operation
-        operation_cost = QUOTA_COST.get(operation, 1) * count
-        
-        # Update usage
-        if today not in quota_data:
-            quota_data[today] = {
-                "used": 0,
-                "operations": {},
-                "remaining": DAILY_QUOTA_LIMIT,
-                "last_updated": datetime.now().isoformat()
-            }
-            
-        # Update operation count
-        if operation not in quota_data[today]["operations"]:
-            quota_data[today]["operations"][operation] = {"count": 0, "cost": 0}
-            
-        quota_data[today]["operations"][operation]["count"] += count
-        quota_data[today]["operations"][operation]["cost"] += operation_cost
-        
-        # Update totals
-        quota_data[today]["used"] += operation_cost
-        quota_data[today]["remaining"] = max(0, DAILY_QUOTA_LIMIT - quota_data[today]["used"])
-        quota_data[today]["last_updated"] = datetime.now().isoformat()
-        
-        # Check if approaching limit
-        if quota_data[today]["remaining"] < 1000:
-            logger.warning(f"!!! WARNING: YouTube API quota running low: {quota_data[today]['remaining']} units remaining !!!")
-        
-        # Save updated data
-        save_quota_usage(quota_data)
-        
-        logger.info(f"YouTube API usage tracked: {operation} (+{operation_cost} units), {quota_data[today]['remaining']} remaining")
-        return quota_data[today]["remaining"]
+        # Write to a temp file and swap it in so a crash never leaves a partial file
+        write_json_atomic(EXISTENCE_CACHE_FILE, cache)
     except Exception as e:
-        logger.error(f"Error tracking API usage: {str(e)}")
-        return None
-
-def check_quota_available(operation, count=1):
-    """
-    Check if there's enough quota available for an operation.
-    
-    Args:
-        operation (str): The API operation to perform
-        count (int): Number of operations planned
-        
-    Returns:
-        bool: True if enough quota is available, False otherwise
-    """
-    try:
-        # Load current usage
-        quota_data = load_quota_usage()
-        today = datetime.now().strftime('%Y-%m-%d')
-        
-        # Get cost of operation
-        operation_cost = QUOTA_COST.get(operation, 1) * count
-        
-        # Get remaining quota
-        if today in quota_data:
-            remaining = quota_data[today].get("remaining", DAILY_QUOTA_LIMIT)
-        else:
-            remaining = DAILY_QUOTA_LIMIT
-            
-        # Check if enough quota is available
-        if remaining >= operation_cost:
-            return True
-        else:
-            logger.warning(f"Not enough YouTube API quota for {operation} ({operation_cost} units needed, {remaining} available)")
-            return False
-    except Exception as e:
-        logger.error(f"Error checking quota availability: {str(e)}")
-        # Default to True to prevent blocking operations due to tracking errors
-        return True
+        logger.error(f"Error saving video existence cache: {str(e)}")
 
 async def main():
     """Main entry point for the application."""
@@ -2,6 +2,7 @@
 Module for scraping TikTok content from specified channels.
 """
 import os
+import asyncio
 import logging
 import requests
 import random
@@ -87,8 +88,8 @@ class TikTokScraper:
         
         logger.info(f"Fetching up to {limit} videos from TikTok user: @{username}")
         
-        # Try the yt-dlp method first as it's most reliable
-        videos = self._scrape_videos_yt_dlp(username, limit)
+        # Try the yt-dlp method first as it's most reliable; it blocks, so run it in a thread
+        videos = await asyncio.to_thread(self._scrape_videos_yt_dlp, username, limit)
         
         if videos:
             logger.info(f"Successfully retrieved {len(videos)} videos using yt-dlp")
@@ -109,7 +110,7 @@ class TikTokScraper:
                 
                 try:
                     # Method 3: Another fallback
-                    return self._scrape_videos_method3(username, limit)
+                    return await asyncio.to_thread(self._scrape_videos_method3, username, limit)
                 except Exception as e:
                     logger.error(f"All scraping methods failed for @{username}: {str(e)}")
                     return []
@@ -223,7 +224,7 @@ class TikTokScraper:
         url = f"https://www.tiktok.com/@{username}"
         
         # Use requests to get the page content
-        response = requests.get(url, headers=self._get_headers(), proxies={'http': self.proxy, 'https': self.proxy} if self.proxy else None)
+        response = await asyncio.to_thread(requests.get, url, headers=self._get_headers(), proxies={'http': self.proxy, 'https': self.proxy} if self.proxy else None)
         
         if response.status_code != 200:
             logger.warning(f"Failed to access TikTok page for @{username}, status code: {response.status_code}")
@@ -311,7 +312,8 @@ class TikTokScraper:
         
         while len(videos) < limit:
             try:
-                response = requests.get(
+                response = await asyncio.to_thread(
+                    requests.get,
                     url, 
                     params=params, 
                     headers=self._get_headers(),
@@ -366,7 +368,7 @@ class TikTokScraper:
                     break
                 
                 # Sleep to avoid rate limiting
-                time.sleep(random.uniform(1.0, 3.0))
+                await asyncio.sleep(random.uniform(1.0, 3.0))
                 
             except Exception as e:
                 logger.error(f"Error in method 2: {str(e)}")
@@ -493,9 +495,8 @@ class TikTokScraper:
             
             logger.info(f"Downloading video from {video_url} using yt-dlp")
             
-            # Use yt-dlp to download the video
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([video_url])
+            # Use yt-dlp to download the video; it blocks, so run it off the event loop
+            await asyncio.to_thread(self._ytdlp_download, ydl_opts, video_url)
             
             # Verify the file was downloaded
             if os.path.exists(output_file):
@@ -516,6 +517,43 @@ class TikTokScraper:
                 logger.error(f"Legacy download also failed for {video_id}: {str(e2)}")
                 return None
     
+    def _ytdlp_download(self, ydl_opts: Dict[str, Any], video_url: str):
+        """
+        Run a blocking yt-dlp download.
+        
+        Args:
+            ydl_opts (Dict[str, Any]): yt-dlp options for this download
+            video_url (str): URL of the video to download
+        """
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            ydl.download([video_url])
+    
+    def _stream_download(self, download_url: str, output_file: str) -> int:
+        """
+        Run a blocking HTTP download of a video file.
+        
+        Args:
+            download_url (str): Direct URL of the video file
+            output_file (str): Path to write the video to
+            
+        Returns:
+            int: HTTP status code; the file is only written on 200
+        """
+        response = requests.get(
+            download_url, 
+            headers=self._get_headers(),
+            stream=True,
+            proxies={'http': self.proxy, 'https': self.proxy} if self.proxy else None
+        )
+        
+        if response.status_code == 200:
+            with open(output_file, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1024):
+                    if chunk:
+                        f.write(chunk)
+        
+        return response.status_code
+    
     async def _legacy_download_video(self, video_data: Dict[str, Any], output_dir: str) -> Optional[str]:
         """
         Legacy method to download a TikTok video using direct requests.
@@ -546,23 +584,13 @@ class TikTokScraper:
                 return None
             
             # Download the video with appropriate headers
-            response = requests.get(
-                download_url, 
-                headers=self._get_headers(),
-                stream=True,
-                proxies={'http': self.proxy, 'https': self.proxy} if self.proxy else None
-            )
+            status_code = await asyncio.to_thread(self._stream_download, download_url, output_file)
             
-            if response.status_code == 200:
-                with open(output_file, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=1024):
-                        if chunk:
-                            f.write(chunk)
-                
+            if status_code == 200:
                 logger.info(f"Downloaded video using legacy method: {output_file}")
                 return output_file
             else:
-                logger.error(f"Failed to download video {video_id}. Status code: {response.status_code}")
+                logger.error(f"Failed to download video {video_id}. Status code: {status_code}")
                 return None
                 
         except Exception as e:
@@ -580,7 +608,8 @@ class TikTokScraper:
             Optional[str]: Download URL if found, None otherwise
         """
         try:
-            response = requests.get(
+            response = await asyncio.to_thread(
+                requests.get,
                 video_url, 
                 headers=self._get_headers(),
                 proxies={'http': self.proxy, 'https': self.proxy} if self.proxy else None
@@ -236,7 +236,7 @@ class VideoHistory:
         Used for checking deleted videos.
         
         Returns:
-            List[Dict]: List of uploaded videos with video_id and youtube_id
+            List[Dict]: List of uploaded videos with video_id, youtube_id and upload_date
         """
         try:
             all_videos = []
@@ -257,7 +257,8 @@ class VideoHistory:
                             'channel': channel,
                             'video_id': video.get('video_id'),
                             'youtube_id': video.get('youtube_id'),
-                            'title': video.get('title', 'Unknown Title')
+                            'title': video.get('title', 'Unknown Title'),
+                            'upload_date': video.get('upload_date')
                         })
             
             return all_videos
@@ -2,13 +2,17 @@
 Module for uploading videos to YouTube as shorts.
 """
 import os
+import copy
 import json
 import logging
 import random
+import tempfile
+import threading
 import time
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, Any, Optional, List, Tuple, Union
 import httplib2
+import google_auth_httplib2
 import google.oauth2.credentials
 import google_auth_oauthlib.flow
 from googleapiclient.discovery import build
@@ -29,6 +33,58 @@ QUOTA_COSTS = {
     'channels.list': 1      # Get channel info
 }
 
+# Parsed quota log and the file (mtime, size, inode) it was read or written at.
+# Every uploader instance and every channel-group process shares the file, so it
+# is re-read whenever any of them changes.
+_quota_cache = {"stamp": None, "data": None}
+# Serializes read-modify-write updates of the quota log between threads
+_quota_lock = threading.RLock()
+
+# Days of per-day quota history kept in the log file
+QUOTA_HISTORY_DAYS = 30
+
+# Today's date and its YYYY-MM-DD key, refreshed when the local day changes
+_today_cache = {"date": None, "str": ""}
+
+def _today_str() -> str:
+    """
+    Get today's date as the YYYY-MM-DD key used in the quota log.
+    
+    Returns:
+        str: Today's local date in ISO format
+    """
+    today = date.today()
+    if today != _today_cache["date"]:
+        _today_cache["date"] = today
+        _today_cache["str"] = today.isoformat()
+    return _today_cache["str"]
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """
+    Write data as JSON to path without ever leaving a partial file behind.
+    
+    The data goes to a uniquely named temp file in the same directory, is
+    fsynced, and is then swapped in with os.replace, so concurrent writers in
+    other threads or processes never share a temp file.
+    
+    Args:
+        path (str): Destination file path
+        data (Any): JSON-serializable data to write
+    """
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+
 class YouTubeUploader:
     """Handles uploading videos to YouTube as shorts."""
     
@@ -153,6 +209,27 @@ class YouTubeUploader:
             logger.error(f"Authentication error: {str(e)}")
             return None
     
+    def clone_for_thread(self) -> 'YouTubeUploader':
+        """
+        Create an uploader for another thread that reuses this one's credentials.
+        
+        httplib2 connections are not thread-safe, so the clone gets its own API
+        client and connection. It does not authenticate again, so threads never
+        refresh or rewrite the token file concurrently.
+        
+        Returns:
+            YouTubeUploader: Uploader with its own API client
+        """
+        clone = copy.copy(self)
+        if self.youtube:
+            clone.youtube = build(
+                self.api_service_name,
+                self.api_version,
+                http=google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http())
+            )
+            clone.api = clone.youtube
+        return clone
+    
     def prepare_metadata(self, video_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Prepare metadata for a YouTube upload.
@@ -285,15 +362,16 @@ class YouTubeUploader:
                 logger.critical("YouTube API quota exceeded! Upload operations will be blocked.")
                 
                 # Force update quota tracking to show we've used all quota
-                today = datetime.now().strftime('%Y-%m-%d')
-                quota_data = self._load_quota_usage()
-                if today not in quota_data:
-                    quota_data[today] = {}
-                quota_data[today]['used'] = self.daily_quota_limit
-                quota_data[today]['remaining'] = 0
-                quota_data[today]['quota_exceeded'] = True
-                quota_data[today]['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                self._save_quota_usage(quota_data)
+                with _quota_lock:
+                    today = _today_str()
+                    quota_data = self._load_quota_usage()
+                    if today not in quota_data:
+                        quota_data[today] = {}
+                    quota_data[today]['used'] = self.daily_quota_limit
+                    quota_data[today]['remaining'] = 0
+                    quota_data[today]['quota_exceeded'] = True
+                    quota_data[today]['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    self._save_quota_usage(quota_data)
             
             return None
             
@@ -442,7 +520,7 @@ class YouTubeUploader:
         if not self.check_quota_available('videos.insert', total_uploads):
             # Determine how many videos we can upload with remaining quota
             quota_data = self._load_quota_usage()
-            today = datetime.now().strftime('%Y-%m-%d')
+            today = _today_str()
             used_quota = quota_data.get(today, {}).get("used", 0)
             remaining_quota = self.daily_quota_limit - used_quota
             
@@ -615,6 +693,53 @@ class YouTubeUploader:
             logger.error(f"Error checking if video exists: {str(e)}")
             return False
     
+    def check_videos_exist(self, video_ids: List[str]) -> Dict[str, bool]:
+        """
+        Check which of several videos still exist on YouTube.
+        
+        IDs are looked up 50 per videos.list call, so each batch costs one quota unit.
+        
+        Args:
+            video_ids (List[str]): YouTube video IDs
+            
+        Returns:
+            Dict[str, bool]: Existence of each video that was checked; IDs that
+                could not be checked (quota or API errors) are left out
+        """
+        if not self.youtube:
+            logger.error("YouTube API client not available")
+            return {}
+        
+        results = {}
+        
+        # Process in batches of 50 (YouTube API limit)
+        for i in range(0, len(video_ids), 50):
+            batch_ids = video_ids[i:i+50]
+            
+            try:
+                # Check if we have enough quota
+                if not self.check_quota_available('videos.list'):
+                    logger.warning(f"Skipping video existence check due to quota limits")
+                    break
+                
+                response = self.youtube.videos().list(
+                    part="id",
+                    id=",".join(batch_ids),
+                    maxResults=50
+                ).execute()
+                
+                # Track API usage
+                self.track_api_usage('videos.list')
+                
+                existing = {item["id"] for item in response.get("items", [])}
+                for video_id in batch_ids:
+                    results[video_id] = video_id in existing
+                
+            except Exception as e:
+                logger.error(f"Error checking if videos exist: {str(e)}")
+        
+        return results
+    
     def _load_quota_usage(self) -> Dict[str, Any]:
         """
         Load YouTube API quota usage data from file.
@@ -624,10 +749,22 @@ class YouTubeUploader:
         """
         try:
             if os.path.exists(self.quota_log_file):
-                with open(self.quota_log_file, 'r') as f:
-                    quota_data = json.load(f)
-                    logger.debug(f"Loaded quota data: {quota_data}")
-                    return quota_data
+                # Reuse the parsed file unless it has been written since
+                st = os.stat(self.quota_log_file)
+                stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+                if _quota_cache["stamp"] != stamp:
+                    with open(self.quota_log_file, 'r') as f:
+                        quota_data = json.load(f)
+                        logger.debug(f"Loaded quota data: {quota_data}")
+                    _quota_cache["stamp"] = stamp
+                    _quota_cache["data"] = quota_data
+                
+                # Callers update today's entry in place, so hand out a copy of it
+                quota_data = dict(_quota_cache["data"])
+                today = _today_str()
+                if today in quota_data:
+                    quota_data[today] = copy.deepcopy(quota_data[today])
+                return quota_data
         except Exception as e:
             logger.error(f"Failed to load quota data: {str(e)}")
         
@@ -645,12 +782,21 @@ class YouTubeUploader:
             bool: True if saved successfully, False otherwise
         """
         try:
-            with open(self.quota_log_file, 'w') as f:
-                json.dump(quota_data, f, indent=2)
+            # Drop days older than the retention window; keys are ISO dates so they compare as strings
+            cutoff = (datetime.now() - timedelta(days=QUOTA_HISTORY_DAYS)).strftime('%Y-%m-%d')
+            quota_data = {day: usage for day, usage in quota_data.items() if day >= cutoff}
+            
+            # Write to a temp file and swap it in so a crash never leaves a truncated file
+            write_json_atomic(self.quota_log_file, quota_data)
             
             # Set proper file permissions if on Unix
             if os.name == 'posix':
                 os.chmod(self.quota_log_file, 0o644)
+            
+            # Remember our own write so the next load doesn't re-read it
+            st = os.stat(self.quota_log_file)
+            _quota_cache["stamp"] = (st.st_mtime_ns, st.st_size, st.st_ino)
+            _quota_cache["data"] = quota_data
                 
             logger.debug(f"Saved quota data: {quota_data}")
             return True
@@ -669,55 +815,56 @@ class YouTubeUploader:
         Returns:
             bool: True if tracking succeeded, False otherwise
         """
-        try:
-            # Get operation cost
-            cost_per_op = QUOTA_COSTS.get(operation, 1)
-            total_cost = cost_per_op * count
-            
-            # Get current date
-            today = datetime.now().strftime('%Y-%m-%d')
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Load existing quota data
-            quota_data = self._load_quota_usage()
-            
-            # Initialize today's entry if it doesn't exist
-            if today not in quota_data:
-                quota_data[today] = {
-                    "used": 0,
-                    "remaining": self.daily_quota_limit,
-                    "last_updated": timestamp,
-                    "operations": {}
-                }
-            
-            # Update usage data
-            quota_data[today]["used"] += total_cost
-            quota_data[today]["remaining"] = max(0, self.daily_quota_limit - quota_data[today]["used"])
-            quota_data[today]["last_updated"] = timestamp
-            
-            # Add or update operation-specific data
-            if operation not in quota_data[today]["operations"]:
-                quota_data[today]["operations"][operation] = {
-                    "count": 0,
-                    "cost": 0
-                }
-            
-            quota_data[today]["operations"][operation]["count"] += count
-            quota_data[today]["operations"][operation]["cost"] += total_cost
-            
-            # Save updated data
-            self._save_quota_usage(quota_data)
-            
-            # Log the quota usage
-            logger.info(f"API Quota: Used {total_cost} units for {operation} ({count} calls). " +
-                        f"Total: {quota_data[today]['used']}/{self.daily_quota_limit}, " +
-                        f"Remaining: {quota_data[today]['remaining']}")
+        with _quota_lock:
+            try:
+                # Get operation cost
+                cost_per_op = QUOTA_COSTS.get(operation, 1)
+                total_cost = cost_per_op * count
+                
+                # Get current date
+                today = _today_str()
+                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                
+                # Load existing quota data
+                quota_data = self._load_quota_usage()
+                
+                # Initialize today's entry if it doesn't exist
+                if today not in quota_data:
+                    quota_data[today] = {
+                        "used": 0,
+                        "remaining": self.daily_quota_limit,
+                        "last_updated": timestamp,
+                        "operations": {}
+                    }
+                
+                # Update usage data
+                quota_data[today]["used"] += total_cost
+                quota_data[today]["remaining"] = max(0, self.daily_quota_limit - quota_data[today]["used"])
+                quota_data[today]["last_updated"] = timestamp
+                
+                # Add or update operation-specific data
+                if operation not in quota_data[today]["operations"]:
+                    quota_data[today]["operations"][operation] = {
+                        "count": 0,
+                        "cost": 0
+                    }
+                
+                quota_data[today]["operations"][operation]["count"] += count
+                quota_data[today]["operations"][operation]["cost"] += total_cost
+                
+                # Save updated data
+                self._save_quota_usage(quota_data)
+                
+                # Log the quota usage
+                logger.info(f"API Quota: Used {total_cost} units for {operation} ({count} calls). " +
+                            f"Total: {quota_data[today]['used']}/{self.daily_quota_limit}, " +
+                            f"Remaining: {quota_data[today]['remaining']}")
+                
+                return True
             
-            return True
-        
-        except Exception as e:
-            logger.error(f"Failed to track API usage: {str(e)}")
-            return False
+            except Exception as e:
+                logger.error(f"Failed to track API usage: {str(e)}")
+                return False
     
     def check_quota_available(self, operation: str, count: int = 1) -> bool:
         """
@@ -736,7 +883,7 @@ class YouTubeUploader:
             total_cost = cost_per_op * count
             
             # Get current date
-            today = datetime.now().strftime('%Y-%m-%d')
+            today = _today_str()
             
             # Load existing quota data
             quota_data = self._load_quota_usage()
@@ -783,6 +930,17 @@ class YouTubeUploader:
             # Conservative approach: if we can't check quota, assume we don't have enough
             return False
     
+    def get_remaining_quota(self) -> int:
+        """
+        Get the quota units left today according to the usage log.
+        
+        Returns:
+            int: Remaining quota units for today
+        """
+        today = _today_str()
+        used = self._load_quota_usage().get(today, {}).get("used", 0)
+        return max(0, self.daily_quota_limit - used)
+    
     def get_quota_summary(self) -> Dict[str, Any]:
         """
         Get a summary of quota usage for today and recent history.
@@ -795,7 +953,7 @@ class YouTubeUploader:
             quota_data = self._load_quota_usage()
             
             # Get current date
-            today = datetime.now().strftime('%Y-%m-%d')
+            today = _today_str()
             
             # Get today's usage
             today_usage = quota_data.get(today, {